@@ -9,9 +9,15 @@ import threading
 import time
 import uuid
 import os
+import shutil
 from typing import Dict, Optional, Any, List, Union
 
 
+# Resolve bash once so every terminal spawn execs an absolute path
+# instead of searching PATH in the child.
+_BASH_PATH = shutil.which("bash") or "bash"
+
+
 class TerminalStore:
     """Store for persistent terminals."""
     _terminals: Dict[str, subprocess.Popen] = {}
@@ -31,16 +37,19 @@ class TerminalStore:
         if cwd is None:
             cwd = "."
             
-        # Start a bash process that stays alive
+        # Start a bash process that stays alive. No preexec_fn is used so
+        # CPython can take its vfork/posix_spawn path instead of a full
+        # fork() of the agent process, and the terminal gets its own session.
         process = subprocess.Popen(
-            ["bash"],
+            [_BASH_PATH],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
             cwd=cwd,
             bufsize=1,
-            universal_newlines=True
+            universal_newlines=True,
+            start_new_session=True
         )
         
         cls._terminals[terminal_id] = process
@@ -12,19 +12,35 @@ Merkle Tree 工作原理演示
 import os
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # 添加路径以便导入模块
 import sys
 import os
-sys.path.insert(0, os.path.dirname(__file__))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-# 使用pygit.py中的路径解析方式
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from src.core.merkle import MerkleTree
+from src.core.hash import HashCalculator
 
-from core.merkle import MerkleTree
-from core.hash import HashCalculator
+
+# 整个演示共用一个哈希计算器
+hash_calculator = HashCalculator()
+
+
+@lru_cache(maxsize=8192)
+def _hash_one(path, mtime_ns, size):
+    """计算单个文件的哈希（按路径、修改时间和大小缓存，文件未变时不重复读取）"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    return hash_calculator.sha1(content)
+
+
+def _write_one(item):
+    """写入单个文件"""
+    file_path, content = item
+    file_path.write_text(content, encoding='utf-8')
 
 
 def merkle_tree_demo():
@@ -52,33 +68,42 @@ def merkle_tree_demo():
             'LICENSE': 'MIT License'
         }
         
-        def create_files(base_path, structure):
+        def flatten_files(base_path, structure):
+            """把嵌套的目录结构展开为 (文件路径, 内容) 列表"""
+            files = []
             for name, content in structure.items():
                 if isinstance(content, dict):
                     # 目录
-                    dir_path = base_path / name
-                    dir_path.mkdir(exist_ok=True)
-                    create_files(dir_path, content)
+                    files.extend(flatten_files(base_path / name, content))
                 else:
                     # 文件
-                    file_path = base_path / name
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    print(f"  创建文件: {file_path.relative_to(Path(temp_dir))}")
+                    files.append((base_path / name, content))
+            return files
+        
+        def create_files(base_path, structure):
+            files = flatten_files(base_path, structure)
+            
+            # 先一次性创建所有目录，再并发写入文件
+            for dir_path in sorted({file_path.parent for file_path, _ in files}):
+                os.makedirs(dir_path, exist_ok=True)
+            
+            with ThreadPoolExecutor() as executor:
+                list(executor.map(_write_one, files))
+            
+            for file_path, _ in files:
+                print(f"  创建文件: {file_path.relative_to(Path(temp_dir))}")
         
         create_files(Path(temp_dir), file_structure)
         print()
         
         # 2. 演示文件哈希计算
         print("2. 文件哈希计算...")
-        hash_calculator = HashCalculator()
         
         def calculate_file_hashes(base_path):
             for file_path in base_path.rglob('*'):
                 if file_path.is_file():
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    file_hash = hash_calculator.sha1(content)
+                    stat = file_path.stat()
+                    file_hash = _hash_one(str(file_path), stat.st_mtime_ns, stat.st_size)
                     print(f"  {file_path.relative_to(base_path)}: {file_hash[:8]}...")
         
         calculate_file_hashes(Path(temp_dir))
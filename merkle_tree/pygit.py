@@ -8,43 +8,108 @@ PyGit 命令行工具
 import sys
 import os
 import argparse
+from importlib import import_module
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from src.commands import (
-    InitCommand,
-    AddCommand,
-    CommitCommand,
-    StatusCommand,
-    LogCommand,
-    DiffCommand,
-    TagCommand,
-    ConfigCommand
-)
 from src.core.repository_manager import Repository
 
 
 class PyGitCLI:
     """PyGit命令行接口"""
     
+    # 命令名 -> '模块:类名'，命令模块、实例和解析器都在首次使用时才创建
+    _COMMAND_PACKAGE = 'src.commands'
+    _COMMAND_REGISTRY = (
+        ('init', 'init:InitCommand'),
+        ('add', 'add:AddCommand'),
+        ('commit', 'commit:CommitCommand'),
+        ('status', 'status:StatusCommand'),
+        ('log', 'log:LogCommand'),
+        ('diff', 'diff:DiffCommand'),
+        ('tag', 'tag:TagCommand'),
+        ('config', 'config:ConfigCommand'),
+    )
+    
     def __init__(self):
-        self.commands = {
-            'init': InitCommand(),
-            'add': AddCommand(),
-            'commit': CommitCommand(),
-            'status': StatusCommand(),
-            'log': LogCommand(),
-            'diff': DiffCommand(),
-            'tag': TagCommand(),
-            'config': ConfigCommand()
-        }
+        self._registry = dict(self._COMMAND_REGISTRY)
+        self.commands = {}
+        
+        self._parser = None
+        self._parser_cache = {}  # 命令名 -> 只注册该命令的解析器
         
-        self.parser = self.create_parser()
+        # 按工作目录缓存的仓库对象: cwd -> (Repository, 元数据状态快照)
+        self._repos = {}
+    
+    def __enter__(self):
+        """进入会话，多次 run 调用之间复用仓库状态"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """退出会话，释放缓存的仓库状态"""
+        self._repos.clear()
+        return False
+    
+    def get_repo(self):
+        """
+        获取当前目录的仓库对象
+        
+        按工作目录缓存。本进程内的修改都经由同一个Repository对象完成，
+        命令执行后会重新记录元数据快照；若快照与磁盘不一致（被其他进程修改），
+        则重新加载仓库。
+        """
+        cwd = os.getcwd()
+        cached = self._repos.get(cwd)
+        if cached is not None:
+            repo, signature = cached
+            if repo.state_signature() == signature:
+                return repo
+        
+        repo = Repository()
+        self._repos[cwd] = (repo, repo.state_signature())
+        return repo
+    
+    def invalidate(self, repo_path=None):
+        """丢弃指定目录（默认为当前目录）缓存的仓库对象"""
+        self._repos.pop(os.path.abspath(repo_path or os.getcwd()), None)
     
-    def create_parser(self):
-        """创建命令行解析器"""
+    def _refresh_signature(self):
+        """命令执行后重新记录当前目录仓库的元数据快照"""
+        cwd = os.getcwd()
+        cached = self._repos.get(cwd)
+        if cached is not None:
+            repo = cached[0]
+            self._repos[cwd] = (repo, repo.state_signature())
+    
+    def get_command(self, name):
+        """获取命令实例（按需导入命令模块并创建）"""
+        command = self.commands.get(name)
+        if command is None:
+            module_name, class_name = self._registry[name].split(':')
+            module = import_module(f'{self._COMMAND_PACKAGE}.{module_name}')
+            command = self.commands[name] = getattr(module, class_name)()
+        return command
+    
+    @property
+    def parser(self):
+        """注册了所有命令的完整解析器，用于帮助信息和未知命令"""
+        if self._parser is None:
+            self._parser = self.create_parser()
+        return self._parser
+    
+    def _get_command_parser(self, name):
+        """获取只注册了单个命令的解析器（缓存复用）"""
+        parser = self._parser_cache.get(name)
+        if parser is None:
+            parser = self._parser_cache[name] = self.create_parser([name])
+        return parser
+    
+    def create_parser(self, names=None):
+        """
+        创建命令行解析器
+        
+        Args:
+            names: 要注册的命令名列表，默认注册所有命令
+        """
         parser = argparse.ArgumentParser(
             prog='pygit',
             description='基于Merkle Tree的版本控制系统'
@@ -63,13 +128,12 @@ class PyGitCLI:
             metavar='COMMAND'
         )
         
-        # 注册所有命令
-        for command in self.commands.values():
-            command.create_parser(subparsers)
+        # 注册命令
+        for name in (names or self._registry):
+            self.get_command(name).create_parser(subparsers)
         
         return parser
     
-        
     def run(self, args=None):
         """运行命令行工具"""
         if args is None:
@@ -80,8 +144,12 @@ class PyGitCLI:
             self.parser.print_help()
             return 1
         
-        # 解析命令
-        parsed_args = self.parser.parse_args(args)
+        # 解析命令：已知命令只构建它自己的子解析器，其余情况使用完整解析器
+        if args[0] in self._registry:
+            parser = self._get_command_parser(args[0])
+        else:
+            parser = self.parser
+        parsed_args = parser.parse_args(args)
         
         if not parsed_args.command:
             self.parser.print_help()
@@ -90,7 +158,10 @@ class PyGitCLI:
         # 执行命令
         command = self.commands.get(parsed_args.command)
         if command:
-            return command.execute(parsed_args)
+            try:
+                return command.execute(parsed_args, self)
+            finally:
+                self._refresh_signature()
         else:
             print(f"未知命令: {parsed_args.command}")
             return 1
@@ -1,15 +1,22 @@
 """
 命令行模块初始化文件
+
+命令类按需导入：访问 src.commands.XxxCommand 时才加载对应模块
 """
 
-from .init import InitCommand
-from .add import AddCommand
-from .commit import CommitCommand
-from .status import StatusCommand
-from .log import LogCommand
-from .diff import DiffCommand
-from .tag import TagCommand
-from .config import ConfigCommand
+from importlib import import_module
+
+# 类名 -> 所在模块
+_COMMAND_MODULES = {
+    'InitCommand': 'init',
+    'AddCommand': 'add',
+    'CommitCommand': 'commit',
+    'StatusCommand': 'status',
+    'LogCommand': 'log',
+    'DiffCommand': 'diff',
+    'TagCommand': 'tag',
+    'ConfigCommand': 'config'
+}
 
 __all__ = [
     'InitCommand',
@@ -20,4 +27,12 @@ __all__ = [
     'DiffCommand',
     'TagCommand',
     'ConfigCommand'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """首次访问命令类时导入其所在模块"""
+    module_name = _COMMAND_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f'.{module_name}', __name__), name)
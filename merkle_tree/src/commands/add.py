@@ -2,15 +2,12 @@
 添加文件命令实现
 """
 
-import sys
 import os
+import sys
 from typing import List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
 
 
 class AddCommand:
@@ -48,10 +45,50 @@ class AddCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    @staticmethod
+    def _existing_paths(paths):
+        """
+        找出存在的路径：每个父目录只扫描一次，而不是逐个路径stat
+        
+        Args:
+            paths: 路径列表
+            
+        Returns:
+            存在的路径集合
+        """
+        by_dir = {}
+        for path in paths:
+            by_dir.setdefault(os.path.dirname(path) or '.', []).append(path)
+        
+        existing = set()
+        for directory, dir_paths in by_dir.items():
+            try:
+                with os.scandir(directory) as it:
+                    names = {item.name for item in it}
+            except OSError:
+                continue
+            
+            for path in dir_paths:
+                name = os.path.basename(path)
+                if name in ('', '.', '..'):
+                    # 'dir/'、'.'等形式无法按名称匹配，直接检查
+                    if os.path.exists(path):
+                        existing.add(path)
+                elif name in names:
+                    existing.add(path)
+        
+        return existing
+    
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
+            repo = ctx.get_repo() if ctx else Repository()
             if not repo.is_valid_repo:
                 print("错误: 不是PyGit仓库")
                 return 1
@@ -59,24 +96,21 @@ class AddCommand:
             if args.all:
                 # 添加所有文件
                 if args.dry_run:
-                    print("将要添加的文件:")
-                    untracked = repo.index.get_untracked_files()
-                    modified = repo.index.get_modified_files()
-                    all_files = set(untracked) | set(modified)
-                    for file_path in sorted(all_files):
-                        print(f"  add '{file_path}'")
+                    # 一次遍历得到未跟踪和已修改的文件，每个路径只出现一次
+                    all_files = sorted(path for path, _ in repo.index.scan_changes())
+                    sys.stdout.write("将要添加的文件:\n" + ''.join(f"  add '{file_path}'\n" for file_path in all_files))
                 else:
                     repo.add_all()
                     print("添加所有文件到暂存区")
             elif args.paths:
                 # 添加指定文件
                 if args.dry_run:
-                    print("将要添加的文件:")
-                    for path in args.paths:
-                        if os.path.exists(path):
-                            print(f"  add '{path}'")
-                        else:
-                            print(f"  错误: '{path}' 不存在")
+                    existing = self._existing_paths(args.paths)
+                    lines = [
+                        f"  add '{path}'\n" if path in existing else f"  错误: '{path}' 不存在\n"
+                        for path in args.paths
+                    ]
+                    sys.stdout.write("将要添加的文件:\n" + ''.join(lines))
                 else:
                     repo.add(args.paths)
                     if len(args.paths) == 1:
@@ -2,15 +2,11 @@
 提交命令实现
 """
 
-import sys
 import os
 from typing import List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
 
 
 class CommitCommand:
@@ -41,21 +37,28 @@ class CommitCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
+            repo = ctx.get_repo() if ctx else Repository()
             if not repo.is_valid_repo:
                 print("错误: 不是PyGit仓库")
                 return 1
             
             # 检查是否有用户配置
-            if not repo.config.get('user', {}).get('name'):
+            user_cfg = repo.config.get('user', {})
+            if not user_cfg.get('name'):
                 print("错误: 请先设置用户名")
                 print("使用: pygit config user.name \"Your Name\"")
                 return 1
             
-            if not repo.config.get('user', {}).get('email'):
+            if not user_cfg.get('email'):
                 print("错误: 请先设置用户邮箱")
                 print("使用: pygit config user.email \"your@email.com\"")
                 return 1
@@ -71,9 +74,8 @@ class CommitCommand:
             # 显示提交信息
             print(f"提交成功: {commit_hash}")
             
-            # 显示简短的提交信息
-            commit = repo.odb.get_object(commit_hash)
-            print(f"  {commit.hash[:8]} {commit.message}")
+            # 显示简短的提交信息（直接使用刚写入的内容，无需再从对象数据库读取）
+            print(f"  {commit_hash[:8]} {args.message}")
             
             return 0
             
@@ -2,15 +2,51 @@
 配置命令实现
 """
 
-import sys
 import os
-from typing import List
+import io
+import configparser
+from typing import Dict, List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
+from ..core.fileio import atomic_write
+
+
+def _global_config_path() -> str:
+    """全局配置文件路径（~/.pygitconfig）"""
+    return os.path.expanduser('~/.pygitconfig')
+
+
+def _load_global_config() -> Dict:
+    """
+    读取全局配置
+    
+    Returns:
+        {节: {键: 值}} 形式的配置字典，文件不存在时为空字典
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(_global_config_path(), encoding='utf-8')
+    return {section: dict(parser[section]) for section in parser.sections()}
+
+
+def _set_global_config(section: str, key: str, value) -> None:
+    """
+    设置单个全局配置项并写回~/.pygitconfig
+    
+    Args:
+        section: 配置节
+        key: 配置键
+        value: 配置值
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(_global_config_path(), encoding='utf-8')
+    if not parser.has_section(section):
+        parser.add_section(section)
+    parser.set(section, key, str(value))
+    
+    buffer = io.StringIO()
+    parser.write(buffer)
+    atomic_write(_global_config_path(), buffer.getvalue().encode('utf-8'))
 
 
 class ConfigCommand:
@@ -36,7 +72,7 @@ class ConfigCommand:
         parser.add_argument(
             '--global',
             action='store_true',
-            help='全局配置（暂未实现）'
+            help='使用全局配置（~/.pygitconfig）'
         )
         parser.add_argument(
             '--list',
@@ -51,18 +87,33 @@ class ConfigCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
-            if not repo.is_valid_repo:
-                print("错误: 不是PyGit仓库")
-                return 1
+            if getattr(args, 'global'):
+                # 全局配置不需要仓库
+                config = _load_global_config()
+                set_config = _set_global_config
+            else:
+                repo = ctx.get_repo() if ctx else Repository()
+                if not repo.is_valid_repo:
+                    print("错误: 不是PyGit仓库")
+                    return 1
+                config = repo.config
+                set_config = repo.set_config
             
             if args.list:
                 # 列出所有配置
+                if not config:
+                    return 0
                 print("配置:")
-                for section, values in repo.config.items():
+                for section, values in config.items():
                     print(f"[{section}]")
                     for key, value in values.items():
                         print(f"  {key} = {value}")
@@ -76,7 +127,7 @@ class ConfigCommand:
                     return 1
                 
                 section, key = keys
-                value = repo.config.get(section, {}).get(key, '')
+                value = config.get(section, {}).get(key, '')
                 print(value)
                 return 0
             
@@ -90,14 +141,9 @@ class ConfigCommand:
                 section, key = keys
                 
                 if section == 'user':
-                    if key == 'name':
-                        email = repo.config.get('user', {}).get('email', '')
-                        repo.set_user_config(args.value, email)
-                        print(f"设置 user.name = {args.value}")
-                    elif key == 'email':
-                        name = repo.config.get('user', {}).get('name', '')
-                        repo.set_user_config(name, args.value)
-                        print(f"设置 user.email = {args.value}")
+                    if key in ('name', 'email'):
+                        set_config('user', key, args.value)
+                        print(f"设置 user.{key} = {args.value}")
                     else:
                         print(f"错误: 不支持的配置项: {args.key}")
                         return 1
@@ -115,7 +161,7 @@ class ConfigCommand:
                     return 1
                 
                 section, key = keys
-                value = repo.config.get(section, {}).get(key, '')
+                value = config.get(section, {}).get(key, '')
                 if value:
                     print(f"{args.key} {value}")
                 return 0
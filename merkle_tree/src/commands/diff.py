@@ -4,13 +4,27 @@
 
 import sys
 import os
+import heapq
 from typing import List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
+
+
+# 差异分组: (Diff字段, 统计标签, 完整格式标题, 完整格式标记)
+_DIFF_SECTIONS = (
+    ('added', '新增', "新增文件:\n", '+'),
+    ('removed', '删除', "删除文件:\n", '-'),
+    ('modified', '修改', "修改文件:\n", 'M'),
+    ('renamed', '重命名', "重命名文件:\n", 'R'),
+)
+
+
+def _section_paths(diff_result, key: str) -> List[str]:
+    """获取差异分组中要显示的路径，重命名显示为 原路径 -> 新路径"""
+    if key == 'renamed':
+        return [f"{old_path} -> {new_path}" for old_path, new_path in diff_result.renamed]
+    return diff_result[key]
 
 
 class DiffCommand:
@@ -40,10 +54,16 @@ class DiffCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
+            repo = ctx.get_repo() if ctx else Repository()
             if not repo.is_valid_repo:
                 print("错误: 不是PyGit仓库")
                 return 1
@@ -56,63 +76,45 @@ class DiffCommand:
                 # 与工作区比较
                 diff_result = repo.diff()
             
-            if not any(diff_result.values()):
+            if not diff_result:
                 print("没有差异")
                 return 0
             
             if args.name_only:
-                # 只显示文件名
-                all_files = []
-                all_files.extend(diff_result['added'])
-                all_files.extend(diff_result['removed'])
-                all_files.extend(diff_result['modified'])
-                
-                for file_path in sorted(all_files):
-                    print(file_path)
+                # 只显示文件名：三个列表各自已按路径排序，线性归并即可；重命名显示新路径
+                renamed = sorted(new_path for _, new_path in diff_result.renamed)
+                merged = heapq.merge(diff_result.added, diff_result.removed, diff_result.modified,
+                                     renamed)
+                sys.stdout.write(''.join(f"{file_path}\n" for file_path in merged))
             
             elif args.stat:
                 # 显示统计信息
-                added_count = len(diff_result['added'])
-                removed_count = len(diff_result['removed'])
-                modified_count = len(diff_result['modified'])
-                
-                total_files = added_count + removed_count + modified_count
+                counts = [len(diff_result[key]) for key, _, _, _ in _DIFF_SECTIONS]
                 
-                print(f" {total_files} 个文件被修改")
-                if added_count:
-                    print(f" {added_count} 个新增文件")
-                if removed_count:
-                    print(f" {removed_count} 个删除文件")
-                if modified_count:
-                    print(f" {modified_count} 个修改文件")
+                out = [f" {sum(counts)} 个文件被修改\n"]
+                out.extend(
+                    f" {count} 个{label}文件\n"
+                    for count, (_, label, _, _) in zip(counts, _DIFF_SECTIONS)
+                    if count
+                )
                 
                 # 显示具体文件
-                for file_path in diff_result['added']:
-                    print(f"  新增: {file_path}")
-                for file_path in diff_result['removed']:
-                    print(f"  删除: {file_path}")
-                for file_path in diff_result['modified']:
-                    print(f"  修改: {file_path}")
+                for key, label, _, _ in _DIFF_SECTIONS:
+                    out.extend(f"  {label}: {file_path}\n"
+                               for file_path in _section_paths(diff_result, key))
+                sys.stdout.write(''.join(out))
             
             else:
                 # 完整差异显示
-                if diff_result['added']:
-                    print("新增文件:")
-                    for file_path in diff_result['added']:
-                        print(f"  + {file_path}")
-                    print()
-                
-                if diff_result['removed']:
-                    print("删除文件:")
-                    for file_path in diff_result['removed']:
-                        print(f"  - {file_path}")
-                    print()
-                
-                if diff_result['modified']:
-                    print("修改文件:")
-                    for file_path in diff_result['modified']:
-                        print(f"  M {file_path}")
-                    print()
+                out = []
+                for key, label, header, marker in _DIFF_SECTIONS:
+                    files = _section_paths(diff_result, key)
+                    if not files:
+                        continue
+                    out.append(header)
+                    out.extend(f"  {marker} {file_path}\n" for file_path in files)
+                    out.append("\n")
+                sys.stdout.write(''.join(out))
             
             return 0
             
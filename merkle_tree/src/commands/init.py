@@ -2,15 +2,11 @@
 初始化命令实现
 """
 
-import sys
 import os
 from typing import List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
 
 
 class InitCommand:
@@ -42,43 +38,47 @@ class InitCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
             # 解析目录路径
             repo_path = os.path.abspath(args.directory)
             
-            # 检查目录是否存在
-            if not os.path.exists(repo_path):
+            # 创建目录（已存在时忽略）
+            try:
+                os.makedirs(repo_path)
                 if not args.quiet:
                     print(f"创建目录: {repo_path}")
-                os.makedirs(repo_path, exist_ok=True)
+            except FileExistsError:
+                pass
             
-            # 切换到目标目录
-            original_cwd = os.getcwd()
-            os.chdir(repo_path)
+            # 检查是否已经是仓库
+            if (Path(repo_path) / '.pygit').exists():
+                print(f"错误: '{repo_path}' 已经是一个PyGit仓库")
+                return 1
+            
+            # 初始化仓库（直接使用目标路径，无需切换工作目录）
+            repo = Repository(repo_path)
+            repo.init(bare=args.bare)
+            
+            # 丢弃初始化前缓存的（无效）仓库对象
+            if ctx:
+                ctx.invalidate(repo_path)
+            
+            if not args.quiet:
+                if args.bare:
+                    print(f"在 '{repo_path}' 初始化空的PyGit裸仓库")
+                else:
+                    print(f"在 '{repo_path}' 初始化空的PyGit仓库")
+            
+            return 0
             
-            try:
-                # 检查是否已经是仓库
-                if Path('.pygit').exists():
-                    print(f"错误: '{repo_path}' 已经是一个PyGit仓库")
-                    return 1
-                
-                # 初始化仓库
-                repo = Repository(repo_path)
-                repo.init(bare=args.bare)
-                
-                if not args.quiet:
-                    if args.bare:
-                        print(f"在 '{repo_path}' 初始化空的PyGit裸仓库")
-                    else:
-                        print(f"在 '{repo_path}' 初始化空的PyGit仓库")
-                
-                return 0
-                
-            finally:
-                os.chdir(original_cwd)
-                
         except Exception as e:
             print(f"初始化仓库失败: {e}")
             return 1
\ No newline at end of file
@@ -8,10 +8,31 @@ from typing import List
 from pathlib import Path
 from datetime import datetime
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
+
+
+# --pretty 的可选格式。用dict的键做集合：成员检查为O(1)，且保持顺序，
+# 帮助和错误信息中的选项顺序保持稳定（frozenset做不到）
+_PRETTY_CHOICES = dict.fromkeys(('oneline', 'short', 'medium', 'full', 'format'))
+
+# 预先构造的日志输出模板
+_ONELINE_FORMAT = "{short_hash} {message}\n"
+_GRAPH_HEAD = "*" + "-" * 60 + "\n"
+_GRAPH_SEPARATOR = "|" + "-" * 60 + "\n"
+_GRAPH_FORMAT = (
+    "| 提交 {short_hash}\n"
+    "| 作者: {author}\n"
+    "| 时间: {timestamp}\n"
+    "| 消息: {message}\n"
+)
+_MEDIUM_FORMAT = (
+    "提交 {hash}\n"
+    "作者: {author}\n"
+    "时间: {timestamp}\n"
+    "\n"
+    "    {message}\n"
+    "\n"
+)
 
 
 class LogCommand:
@@ -43,16 +64,22 @@ class LogCommand:
         )
         parser.add_argument(
             '--pretty',
-            choices=['oneline', 'short', 'medium', 'full', 'format'],
+            choices=_PRETTY_CHOICES,
             default='medium',
             help='自定义提交格式'
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
+            repo = ctx.get_repo() if ctx else Repository()
             if not repo.is_valid_repo:
                 print("错误: 不是PyGit仓库")
                 return 1
@@ -69,34 +96,30 @@ class LogCommand:
             
             if args.oneline or args.pretty == 'oneline':
                 # 单行格式
-                for commit in commits:
-                    print(f"{commit['hash'][:8]} {commit['message']}")
+                out = ''.join(_ONELINE_FORMAT.format(short_hash=commit['hash'][:8], **commit)
+                              for commit in commits)
             elif args.graph:
                 # 图形格式（简化版本）
+                parts = []
+                last = len(commits) - 1
                 for i, commit in enumerate(commits):
-                    if i == 0:
-                        print("*" + "-" * 60)
-                    else:
-                        print("|" + "-" * 60)
-                    print(f"| 提交 {commit['hash'][:8]}")
-                    print(f"| 作者: {commit['author']}")
-                    print(f"| 时间: {commit['timestamp']}")
-                    print(f"| 消息: {commit['message']}")
-                    if i < len(commits) - 1:
-                        print("*" + "-" * 60)
+                    parts.append(_GRAPH_HEAD if i == 0 else _GRAPH_SEPARATOR)
+                    parts.append(_GRAPH_FORMAT.format(short_hash=commit['hash'][:8], **commit))
+                    if i < last:
+                        parts.append(_GRAPH_HEAD)
+                out = ''.join(parts)
             else:
                 # 默认格式
+                parts = []
                 for commit in commits:
-                    print(f"提交 {commit['hash']}")
-                    print(f"作者: {commit['author']}")
-                    print(f"时间: {commit['timestamp']}")
-                    print()
-                    print(f"    {commit['message']}")
-                    print()
-                    
+                    parts.append(_MEDIUM_FORMAT.format_map(commit))
                     if commit['parent_hash']:
-                        print(f"父提交: {commit['parent_hash'][:8]}")
-                    print()
+                        parts.append(f"父提交: {commit['parent_hash'][:8]}\n")
+                    parts.append('\n')
+                out = ''.join(parts)
+            
+            # 一次写出全部日志，避免逐行print
+            sys.stdout.write(out)
             
             return 0
             
@@ -2,15 +2,44 @@
 状态命令实现
 """
 
-import sys
 import os
+import sys
 from typing import List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
+
+
+_HEADS_PREFIX = 'refs/heads/'
+
+
+def _short_branch_name(ref: str) -> str:
+    """去掉分支引用的 refs/heads/ 前缀"""
+    if ref.startswith(_HEADS_PREFIX):
+        return ref[len(_HEADS_PREFIX):]
+    return ref
+
+
+def _render_file_group(title: str, paths: List[str], fmt: str, blank_line: bool = False) -> str:
+    """
+    渲染一组文件，没有文件时返回空字符串
+    
+    Args:
+        title: 分组标题
+        paths: 文件路径列表
+        fmt: 单个文件的输出格式（不含换行）
+        blank_line: 是否在分组后输出空行
+        
+    Returns:
+        渲染后的文本
+    """
+    if not paths:
+        return ''
+    
+    line_fmt = fmt + '\n'
+    body = ''.join(line_fmt.format(file_path) for file_path in paths)
+    text = f"{title}\n{body}"
+    return text + '\n' if blank_line else text
 
 
 class StatusCommand:
@@ -36,10 +65,16 @@ class StatusCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
+            repo = ctx.get_repo() if ctx else Repository()
             if not repo.is_valid_repo:
                 print("错误: 不是PyGit仓库")
                 return 1
@@ -48,81 +83,46 @@ class StatusCommand:
             
             if args.porcelain:
                 # 机器可读格式
-                for file_path in status['staged_files']:
-                    print(f"A  {file_path}")
-                for file_path in status['modified_files']:
-                    print(f" M {file_path}")
-                for file_path in status['untracked_files']:
-                    print(f"?? {file_path}")
+                out = (
+                    ''.join(f"A  {file_path}\n" for file_path in status['staged_files'])
+                    + ''.join(f" M {file_path}\n" for file_path in status['modified_files'])
+                    + ''.join(f"?? {file_path}\n" for file_path in status['untracked_files'])
+                )
             elif args.short:
                 # 短格式
-                branch = status['branch']
-                if branch.startswith('refs/heads/'):
-                    branch = branch[11:]  # 移除 'refs/heads/' 前缀
-                
-                print(f"## {branch}")
-                
-                staged_files = status['staged_files']
-                modified_files = status['modified_files']
-                untracked_files = status['untracked_files']
-                
-                if staged_files:
-                    print("已暂存的文件:")
-                    for file_path in staged_files:
-                        print(f"  M {file_path}")
-                
-                if modified_files:
-                    print("已修改但未暂存的文件:")
-                    for file_path in modified_files:
-                        print(f"  M {file_path}")
+                branch = _short_branch_name(status['branch'])
                 
-                if untracked_files:
-                    print("未跟踪的文件:")
-                    for file_path in untracked_files:
-                        print(f"  ?? {file_path}")
+                out = (
+                    f"## {branch}\n"
+                    + _render_file_group("已暂存的文件:", status['staged_files'], "  M {}")
+                    + _render_file_group("已修改但未暂存的文件:", status['modified_files'], "  M {}")
+                    + _render_file_group("未跟踪的文件:", status['untracked_files'], "  ?? {}")
+                )
                 
                 if status['is_clean']:
-                    print("工作目录干净")
+                    out += "工作目录干净\n"
             else:
                 # 完整格式
-                branch = status['branch']
-                if branch.startswith('refs/heads/'):
-                    branch = branch[11:]  # 移除 'refs/heads/' 前缀
+                branch = _short_branch_name(status['branch'])
                 
-                print(f"位于分支 {branch}")
+                out = f"位于分支 {branch}\n"
                 
                 if status['head']:
-                    print(f"提交 {status['head'][:8]}")
+                    out += f"提交 {status['head'][:8]}\n"
                 else:
-                    print("初始提交")
-                
-                print()
-                
-                staged_files = status['staged_files']
-                modified_files = status['modified_files']
-                untracked_files = status['untracked_files']
-                
-                if staged_files:
-                    print("已暂存的文件:")
-                    for file_path in staged_files:
-                        print(f"  新文件:   {file_path}")
-                    print()
-                
-                if modified_files:
-                    print("已修改但未暂存的文件:")
-                    for file_path in modified_files:
-                        print(f"  已修改:   {file_path}")
-                    print()
+                    out += "初始提交\n"
                 
-                if untracked_files:
-                    print("未跟踪的文件:")
-                    for file_path in untracked_files:
-                        print(f"  {file_path}")
-                    print()
+                out += (
+                    "\n"
+                    + _render_file_group("已暂存的文件:", status['staged_files'], "  新文件:   {}", blank_line=True)
+                    + _render_file_group("已修改但未暂存的文件:", status['modified_files'], "  已修改:   {}", blank_line=True)
+                    + _render_file_group("未跟踪的文件:", status['untracked_files'], "  {}", blank_line=True)
+                )
                 
                 if status['is_clean']:
-                    print("没有要提交的文件，工作目录干净")
+                    out += "没有要提交的文件，工作目录干净\n"
             
+            sys.stdout.write(out)
             return 0
             
         except Exception as e:
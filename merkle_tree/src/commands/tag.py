@@ -2,15 +2,11 @@
 标签命令实现
 """
 
-import sys
 import os
 from typing import List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository_manager import Repository
+from ..core.repository_manager import Repository
 
 
 class TagCommand:
@@ -57,10 +53,16 @@ class TagCommand:
         )
         return parser
     
-    def execute(self, args):
-        """执行命令"""
+    def execute(self, args, ctx=None):
+        """
+        执行命令
+        
+        Args:
+            args: 解析后的命令行参数
+            ctx: 命令上下文（PyGitCLI），用于复用仓库对象
+        """
         try:
-            repo = Repository()
+            repo = ctx.get_repo() if ctx else Repository()
             if not repo.is_valid_repo:
                 print("错误: 不是PyGit仓库")
                 return 1
@@ -126,7 +128,7 @@ class TagCommand:
             
             else:
                 # 没有参数，列出标签
-                return self.execute(type('Args', (), {'list': True})())
+                return self.execute(type('Args', (), {'list': True})(), ctx)
             
         except Exception as e:
             print(f"标签操作失败: {e}")
@@ -5,6 +5,6 @@
 from .hash import HashCalculator
 from .repository import ObjectDatabase
 from .index import Index
-from .merkle import MerkleTree
+from .merkle import MerkleTree, Diff
 
-__all__ = ['HashCalculator', 'ObjectDatabase', 'Index', 'MerkleTree']
\ No newline at end of file
+__all__ = ['HashCalculator', 'ObjectDatabase', 'Index', 'MerkleTree', 'Diff']
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+文件写入工具
+
+提供仓库元数据文件（索引、配置）的原子写入
+"""
+
+import os
+import tempfile
+from typing import Union
+from pathlib import Path
+
+
+def atomic_write(path: Union[str, Path], data: bytes) -> None:
+    """
+    原子地写入文件
+    
+    先把数据一次性写入同目录下的临时文件并fsync，再用os.replace替换目标文件。
+    读取方要么看到旧内容，要么看到完整的新内容，不会读到写了一半的文件。
+    
+    Args:
+        path: 目标文件路径
+        data: 要写入的字节数据
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or '.'
+    
+    # 保留目标文件原有的权限，新文件使用常规的0644
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -7,8 +7,92 @@
 - 文件内容哈希
 """
 
+import os
+import mmap
+import time
 import hashlib
-from typing import Union
+import threading
+from stat import S_ISREG
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Union
+
+# 直接绑定OpenSSL实现的SHA-1构造函数，避免每次查找属性
+_sha1 = hashlib.sha1
+
+# 常见对象类型的头部前缀（已编码），避免每次格式化并编码整个头部
+_HEADER_PREFIXES = {
+    obj_type: f"{obj_type} ".encode('ascii')
+    for obj_type in ('blob', 'tree', 'commit', 'tag')
+}
+
+# 达到该大小的文件通过mmap计算哈希，避免整块读入内存
+_MMAP_THRESHOLD = 1 << 20
+
+# 无法映射的文件（管道、特殊文件系统等）分块流式计算哈希时的块大小
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# 文件哈希缓存: (st_dev, st_ino, st_mtime_ns, st_ctime_ns, st_size) -> 哈希
+# 多个线程可能同时计算哈希，读写缓存需要加锁
+_HASH_CACHE_SIZE = 65536
+_hash_cache = OrderedDict()
+_hash_cache_lock = threading.Lock()
+
+# 批量计算对象哈希时，不小于该大小的内容分到多个线程并行计算
+# （hashlib处理较大的数据时会释放GIL），同时处理的路数为_HASH_LANES
+_PARALLEL_HASH_MIN_SIZE = 64 * 1024
+_HASH_LANES = 4
+
+# 最近这段时间内修改过的文件可能在同一时间戳内再次被修改，不缓存其哈希
+_RACY_WINDOW_NS = 1_000_000_000
+
+
+def _hash_stream(f) -> str:
+    """
+    分块读取文件并增量计算SHA-1哈希值
+    
+    复用同一个缓冲区，内存占用固定为一个块；提示内核按顺序预读
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    
+    hasher = _sha1()
+    buffer = bytearray(_STREAM_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        count = f.readinto(buffer)
+        if not count:
+            break
+        hasher.update(view[:count])
+    return hasher.hexdigest()
+
+
+def _hash_file_uncached(file_path: str) -> str:
+    """读取文件并计算内容的SHA-1哈希值"""
+    with open(file_path, 'rb', buffering=0) as f:
+        file_stat = os.fstat(f.fileno())
+        if not S_ISREG(file_stat.st_mode):
+            # 非普通文件的大小不可信，只能流式读取
+            return _hash_stream(f)
+        
+        size = file_stat.st_size
+        if size < _MMAP_THRESHOLD:
+            return _sha1(f.read()).hexdigest()
+        
+        # 大文件直接映射，由hashlib按页读取，不在用户态复制
+        try:
+            mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return _hash_stream(f)
+        
+        with mapped:
+            if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return _sha1(mapped).hexdigest()
 
 
 class HashCalculator:
@@ -28,7 +112,7 @@ class HashCalculator:
         if isinstance(data, str):
             data = data.encode('utf-8')
         
-        return hashlib.sha1(data).hexdigest()
+        return _sha1(data).hexdigest()
     
     @staticmethod
     def hash_object(obj_type: str, content: Union[str, bytes]) -> str:
@@ -47,17 +131,55 @@ class HashCalculator:
         if isinstance(content, str):
             content = content.encode('utf-8')
         
-        # Git对象格式
-        header = f"{obj_type} {len(content)}\0"
-        full_content = header.encode('utf-8') + content
+        # Git对象格式：头部和内容分别送入哈希器，不拼接出完整副本
+        prefix = _HEADER_PREFIXES.get(obj_type) or f"{obj_type} ".encode('utf-8')
+        hasher = _sha1(prefix)
+        hasher.update(b"%d\0" % len(content))
+        hasher.update(content)
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def hash_objects(obj_type: str, contents: List[bytes]) -> List[str]:
+        """
+        批量计算同一类型的多个Git对象的哈希值
+        
+        小对象在一个列表推导式里拼接头部后直接计算，省去逐个调用hash_object的开销；
+        较大的对象有至少_HASH_LANES个时，分成多路在线程中并行计算。
+        
+        Args:
+            obj_type: 对象类型（blob, tree, commit）
+            contents: 对象内容列表
+            
+        Returns:
+            与contents一一对应的哈希值列表
+        """
+        digest = partial(HashCalculator.hash_object, obj_type)
+        header = (_HEADER_PREFIXES.get(obj_type) or f"{obj_type} ".encode('utf-8')) + b"%d\0"
+        sha1 = _sha1
+        
+        # 小对象拼接头部的复制开销可以忽略；大对象留空，稍后不拼接地计算
+        hashes = [sha1(header % len(content) + content).hexdigest()
+                  if len(content) < _PARALLEL_HASH_MIN_SIZE else None
+                  for content in contents]
         
-        return HashCalculator.sha1(full_content)
+        large = [i for i, value in enumerate(hashes) if value is None]
+        if len(large) < _HASH_LANES:
+            for i in large:
+                hashes[i] = digest(contents[i])
+            return hashes
+        
+        with ThreadPoolExecutor(max_workers=_HASH_LANES) as executor:
+            for i, value in zip(large, executor.map(digest, [contents[i] for i in large])):
+                hashes[i] = value
+        return hashes
     
     @staticmethod
     def hash_file_content(file_path: str) -> str:
         """
         计算文件内容的哈希值
         
+        结果按文件的stat信息缓存，同一进程内未变化的文件只计算一次。
+        
         Args:
             file_path: 文件路径
             
@@ -65,9 +187,22 @@ class HashCalculator:
             文件内容的哈希值
         """
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            return HashCalculator.sha1(content)
+            stat = os.stat(file_path)
+            key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+            with _hash_cache_lock:
+                cached = _hash_cache.get(key)
+                if cached is not None:
+                    _hash_cache.move_to_end(key)
+                    return cached
+            
+            digest = _hash_file_uncached(file_path)
+            
+            if time.time_ns() - max(stat.st_mtime_ns, stat.st_ctime_ns) > _RACY_WINDOW_NS:
+                with _hash_cache_lock:
+                    _hash_cache[key] = digest
+                    if len(_hash_cache) > _HASH_CACHE_SIZE:
+                        _hash_cache.popitem(last=False)
+            return digest
         except FileNotFoundError:
             raise FileNotFoundError(f"文件不存在: {file_path}")
         except Exception as e:
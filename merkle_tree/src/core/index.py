@@ -6,18 +6,36 @@
 
 import os
 import sys
-import json
-from typing import Dict, List, Optional, Set
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.hash import HashCalculator
+from .hash import HashCalculator
+from .fileio import atomic_write
 
 
-@dataclass
+# 需要比较内容哈希的文件达到该数量时才并行计算
+_PARALLEL_HASH_THRESHOLD = 8
+
+# 二进制索引格式：
+#   头部: 签名 'PGIX' + 版本号 + 条目数
+#   条目: 模式(整数) + 大小 + mtime + 阶段 + 20字节哈希 + 路径长度
+#         [+ ctime + inode（版本3）]，后接UTF-8路径
+_INDEX_SIGNATURE = b'PGIX'
+_INDEX_VERSION = 3
+_HEADER_STRUCT = struct.Struct('<4sII')
+_ENTRY_STRUCTS = {
+    2: struct.Struct('<IQdI20sH'),
+    3: struct.Struct('<IQdI20sHdQ'),
+}
+
+# Python 3.10+ 为IndexEntry生成__slots__，减少每个条目的内存并加快属性访问
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class IndexEntry:
     """索引条目"""
     path: str                    # 文件路径
@@ -26,10 +44,21 @@ class IndexEntry:
     size: int                    # 文件大小
     mtime: float                 # 修改时间
     stage: int = 0               # 暂存区阶段（用于合并）
+    ctime: float = 0.0           # 状态改变时间
+    ino: int = 0                 # inode号（0表示未记录）
     
     def to_dict(self) -> Dict:
-        """转换为字典"""
-        return asdict(self)
+        """转换为字典（字段都是标量，直接构造即可，无需asdict的递归复制）"""
+        return {
+            'path': self.path,
+            'mode': self.mode,
+            'blob_hash': self.blob_hash,
+            'size': self.size,
+            'mtime': self.mtime,
+            'stage': self.stage,
+            'ctime': self.ctime,
+            'ino': self.ino
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'IndexEntry':
@@ -51,6 +80,13 @@ class Index:
         self.index_file = self.repo_path / '.pygit' / 'index'
         self.entries: Dict[str, IndexEntry] = {}  # path -> IndexEntry
         
+        # 批量更新状态：在 with index: 块内修改只标记为脏，退出时统一写入
+        self._dirty = False
+        self._batch_depth = 0
+        
+        # 索引文件最后写入的时间，用于判断条目是否处于"racy"状态
+        self._index_mtime = 0.0
+        
         # 确保索引目录存在
         self.index_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -63,27 +99,107 @@ class Index:
             return
         
         try:
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.index_file, 'rb') as f:
+                data = f.read()
+                self._index_mtime = os.fstat(f.fileno()).st_mtime
             
             self.entries.clear()
-            for entry_data in data.get('entries', []):
-                entry = IndexEntry.from_dict(entry_data)
-                self.entries[entry.path] = entry
+            if data.startswith(_INDEX_SIGNATURE):
+                self._load_binary(data)
+            else:
+                # 兼容旧版JSON格式的索引，下次保存时转换为二进制格式
+                import json
+                for entry_data in json.loads(data.decode('utf-8')).get('entries', []):
+                    entry = IndexEntry.from_dict(entry_data)
+                    self.entries[entry.path] = entry
                 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (KeyError, ValueError, struct.error) as e:
             print(f"警告: 索引文件损坏，重新创建: {e}")
             self.entries.clear()
     
+    def _load_binary(self, data: bytes) -> None:
+        """
+        解析二进制格式的索引
+        
+        Args:
+            data: 索引文件内容
+        """
+        _, version, count = _HEADER_STRUCT.unpack_from(data, 0)
+        entry_struct = _ENTRY_STRUCTS.get(version)
+        if entry_struct is None:
+            raise ValueError(f"不支持的索引版本: {version}")
+        
+        offset = _HEADER_STRUCT.size
+        unpack_entry = entry_struct.unpack_from
+        entry_size = entry_struct.size
+        
+        for _ in range(count):
+            fields = unpack_entry(data, offset)
+            mode, size, mtime, stage, blob_hash, path_len = fields[:6]
+            ctime, ino = fields[6:] or (0.0, 0)
+            offset += entry_size
+            path = data[offset:offset + path_len].decode('utf-8')
+            offset += path_len
+            
+            self.entries[path] = IndexEntry(
+                path=path,
+                mode=format(mode, '06o'),
+                blob_hash=blob_hash.hex(),
+                size=size,
+                mtime=mtime,
+                stage=stage,
+                ctime=ctime,
+                ino=ino
+            )
+        
+        if offset > len(data):
+            raise ValueError("索引文件被截断")
+    
     def save(self) -> None:
-        """保存索引文件"""
-        data = {
-            'version': 1,
-            'entries': [entry.to_dict() for entry in self.entries.values()]
-        }
+        """保存索引文件（二进制格式）"""
+        buffer = bytearray(_HEADER_STRUCT.pack(_INDEX_SIGNATURE, _INDEX_VERSION, len(self.entries)))
+        pack_entry = _ENTRY_STRUCTS[_INDEX_VERSION].pack
         
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        for entry in self.entries.values():
+            path = entry.path.encode('utf-8')
+            buffer += pack_entry(
+                int(entry.mode, 8),
+                entry.size,
+                entry.mtime,
+                entry.stage,
+                bytes.fromhex(entry.blob_hash),
+                len(path),
+                entry.ctime,
+                entry.ino
+            )
+            buffer += path
+        
+        atomic_write(self.index_file, buffer)
+        self._index_mtime = os.stat(self.index_file).st_mtime
+        self._dirty = False
+    
+    def flush(self) -> None:
+        """有未保存的修改时写入索引文件"""
+        if self._dirty:
+            self.save()
+    
+    def _mark_dirty(self) -> None:
+        """记录一次修改：批量更新中只标记，否则立即写入"""
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.save()
+    
+    def __enter__(self) -> 'Index':
+        """开始批量更新，期间的修改在退出时只写入一次"""
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """结束批量更新并写入累积的修改"""
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
+        return False
     
     def add_entry(self, entry: IndexEntry) -> None:
         """
@@ -93,7 +209,7 @@ class Index:
             entry: 索引条目
         """
         self.entries[entry.path] = entry
-        self.save()
+        self._mark_dirty()
     
     def remove_entry(self, path: str) -> bool:
         """
@@ -107,7 +223,7 @@ class Index:
         """
         if path in self.entries:
             del self.entries[path]
-            self.save()
+            self._mark_dirty()
             return True
         return False
     
@@ -174,8 +290,6 @@ class Index:
         
         # 获取文件信息
         stat = full_path.stat()
-        size = stat.st_size
-        mtime = stat.st_mtime
         
         # 计算文件哈希
         blob_hash = HashCalculator.hash_file_content(str(full_path))
@@ -185,8 +299,10 @@ class Index:
             path=file_path,
             mode=mode,
             blob_hash=blob_hash,
-            size=size,
-            mtime=mtime
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            ctime=stat.st_ctime,
+            ino=stat.st_ino
         )
         
         self.add_entry(entry)
@@ -223,60 +339,229 @@ class Index:
         if not full_path.exists():
             return True
         
-        # 检查修改时间
-        stat = full_path.stat()
-        if stat.st_mtime != entry.mtime:
-            return True
+        return self._is_entry_modified(entry, full_path.stat(), full_path)
+    
+    def _is_entry_modified(self, entry: IndexEntry, stat: os.stat_result, full_path: Path) -> bool:
+        """
+        根据已获取的文件状态判断索引条目对应的文件是否被修改
         
-        # 检查文件大小
-        if stat.st_size != entry.size:
-            return True
+        Args:
+            entry: 索引条目
+            stat: 文件的stat结果
+            full_path: 文件完整路径
+            
+        Returns:
+            文件是否被修改
+        """
+        modified = self._check_stat(entry, stat)
+        if modified is not None:
+            return modified
         
-        # 检查文件内容哈希
-        current_hash = HashCalculator.hash_file_content(str(full_path))
-        if current_hash != entry.blob_hash:
+        # stat无法确定，比较文件内容哈希
+        return HashCalculator.hash_file_content(str(full_path)) != entry.blob_hash
+    
+    def _check_stat(self, entry: IndexEntry, stat: os.stat_result, trust_stat: bool = True) -> Optional[bool]:
+        """
+        仅根据stat结果判断文件是否被修改
+        
+        mtime或大小变化时一定被修改；inode/ctime一致且条目不处于racy状态
+        （文件mtime早于索引写入时间）时可信任stat，认为未修改。
+        其余情况需要比较内容哈希。
+        
+        Args:
+            entry: 索引条目
+            stat: 文件的stat结果
+            trust_stat: 是否信任stat结果，为False时总是比较内容哈希
+            
+        Returns:
+            True/False表示已确定是否修改，None表示需要比较内容哈希
+        """
+        if stat.st_mtime != entry.mtime or stat.st_size != entry.size:
             return True
         
+        if not trust_stat:
+            return None
+        
+        # 旧索引没有记录inode时只依据mtime和大小
+        if entry.ino and (stat.st_ino != entry.ino or stat.st_ctime != entry.ctime):
+            return None
+        
+        # 与索引同一时刻写入的文件，之后的修改可能不改变mtime
+        if entry.mtime >= self._index_mtime:
+            return None
+        
         return False
     
-    def get_modified_files(self) -> List[str]:
+    def _find_modified(self, entries: Iterable[IndexEntry], trust_stat: bool = True) -> Set[str]:
         """
-        获取所有被修改的文件
+        分两阶段找出被修改的索引条目
+        
+        先stat所有文件，能仅凭stat确定结果的直接判定；
+        其余文件才需要比较内容哈希，数量较多时用线程池并行计算
+        （hashlib和文件读取都会释放GIL）。
         
+        Args:
+            entries: 要检查的索引条目
+            trust_stat: 是否信任stat结果
+            
         Returns:
-            被修改的文件路径列表
+            被修改的文件路径集合
         """
-        modified = []
+        modified = set()
+        to_hash = []
         
-        for file_path in self.get_tracked_files():
-            if self.is_file_modified(file_path):
-                modified.append(file_path)
+        for entry in entries:
+            try:
+                stat = (self.repo_path / entry.path).stat()
+            except FileNotFoundError:
+                modified.add(entry.path)
+                continue
+            
+            result = self._check_stat(entry, stat, trust_stat)
+            if result is None:
+                to_hash.append(entry)
+            elif result:
+                modified.add(entry.path)
         
+        modified.update(self._hash_changed(to_hash))
         return modified
     
+    def _hash_changed(self, entries: List[IndexEntry]) -> Set[str]:
+        """
+        比较内容哈希，找出内容已改变的索引条目
+        
+        数量达到_PARALLEL_HASH_THRESHOLD时用线程池并行计算
+        
+        Args:
+            entries: 需要比较内容哈希的索引条目
+            
+        Returns:
+            内容已改变的文件路径集合
+        """
+        full_paths = [str(self.repo_path / entry.path) for entry in entries]
+        if len(full_paths) < _PARALLEL_HASH_THRESHOLD:
+            hashes = map(HashCalculator.hash_file_content, full_paths)
+        else:
+            with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as executor:
+                hashes = list(executor.map(HashCalculator.hash_file_content, full_paths, chunksize=16))
+        
+        return {
+            entry.path
+            for entry, current_hash in zip(entries, hashes)
+            if current_hash != entry.blob_hash
+        }
+    
+    def get_modified_files(self) -> List[str]:
+        """
+        获取所有被修改的文件
+        
+        Returns:
+            被修改的文件路径列表（按路径排序）
+        """
+        return sorted(self._find_modified(self.entries.values()))
+    
+    def _iter_untracked(self) -> Iterator[str]:
+        """
+        遍历工作目录，逐个产生未被跟踪的文件路径
+        
+        使用os.scandir的显式栈遍历，目录类型来自readdir结果，
+        相对路径由父目录前缀直接拼接。跳过.git/.pygit等隐藏目录，不跟随目录符号链接。
+        
+        Yields:
+            未被跟踪的文件路径
+        """
+        entries = self.entries
+        stack = [(str(self.repo_path), '')]
+        
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as it:
+                for item in it:
+                    rel_path = prefix + item.name
+                    
+                    if item.is_dir():
+                        if not item.name.startswith('.') and not item.is_symlink():
+                            stack.append((item.path, rel_path + os.sep))
+                        continue
+                    
+                    if rel_path not in entries:
+                        yield rel_path
+    
     def get_untracked_files(self) -> List[str]:
         """
         获取未被跟踪的文件
         
         Returns:
-            未被跟踪的文件路径列表
+            未被跟踪的文件路径列表（按路径排序）
         """
-        untracked = []
-        tracked_files = self.get_tracked_files()
+        return sorted(self._iter_untracked())
+    
+    def scan_working_tree(self) -> Tuple[List[str], List[str]]:
+        """
+        一次遍历工作目录，同时找出未跟踪和被修改的文件
         
-        # 遍历工作目录
-        for root, dirs, files in os.walk(self.repo_path):
-            # 跳过.git/.pygit目录
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                full_path = Path(root) / file
-                rel_path = str(full_path.relative_to(self.repo_path))
-                
-                if rel_path not in tracked_files:
-                    untracked.append(rel_path)
+        已跟踪文件直接使用遍历得到的stat结果判断，无法仅凭stat确定的
+        文件最后统一比较内容哈希。
         
-        return untracked
+        Returns:
+            (未跟踪文件列表, 被修改文件列表) 元组，均按路径排序
+        """
+        entries = self.entries
+        unseen = set(entries)
+        untracked = []
+        modified = set()
+        to_hash = []
+        stack = [(str(self.repo_path), '')]
+        
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as it:
+                for item in it:
+                    rel_path = prefix + item.name
+                    
+                    if item.is_dir():
+                        # 跳过.git/.pygit等隐藏目录，不跟随目录符号链接
+                        if not item.name.startswith('.') and not item.is_symlink():
+                            stack.append((item.path, rel_path + os.sep))
+                        continue
+                    
+                    entry = entries.get(rel_path)
+                    if entry is None:
+                        untracked.append(rel_path)
+                        continue
+                    
+                    unseen.discard(rel_path)
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        # 变成悬空符号链接或在遍历过程中被删除，与_find_modified一样视为已修改
+                        modified.add(rel_path)
+                        continue
+                    result = self._check_stat(entry, stat)
+                    if result is None:
+                        to_hash.append(entry)
+                    elif result:
+                        modified.add(rel_path)
+        
+        # 遍历中没有遇到的已跟踪文件（已删除或位于隐藏目录中）
+        modified.update(self._find_modified(entries[path] for path in unseen))
+        modified.update(self._hash_changed(to_hash))
+        
+        untracked.sort()
+        return untracked, sorted(modified)
+    
+    def scan_changes(self) -> Iterator[Tuple[str, str]]:
+        """
+        一次遍历工作目录，同时找出未跟踪和被修改的文件
+        
+        Yields:
+            (文件路径, 状态) 元组，状态为 'U'（未跟踪）或 'M'（已修改）
+        """
+        untracked, modified = self.scan_working_tree()
+        for file_path in untracked:
+            yield file_path, 'U'
+        for file_path in modified:
+            yield file_path, 'M'
     
     def get_staged_files(self) -> List[str]:
         """
@@ -306,7 +591,7 @@ class Index:
     def clear(self) -> None:
         """清空索引"""
         self.entries.clear()
-        self.save()
+        self._mark_dirty()
     
     def get_stats(self) -> Dict:
         """
@@ -317,8 +602,9 @@ class Index:
         """
         total_files = len(self.entries)
         total_size = sum(entry.size for entry in self.entries.values())
-        modified_files = len(self.get_modified_files())
-        untracked_files = len(self.get_untracked_files())
+        untracked, modified = self.scan_working_tree()
+        modified_files = len(modified)
+        untracked_files = len(untracked)
         
         return {
             'total_files': total_files,
@@ -328,29 +614,21 @@ class Index:
             'staged_files': total_files
         }
     
-    def validate(self) -> Dict:
+    def validate(self, trust_stat: bool = False) -> Dict:
         """
         验证索引完整性
         
+        Args:
+            trust_stat: 是否信任stat结果；默认为False，即对所有文件比较内容哈希
+            
         Returns:
             验证结果字典
         """
-        valid_entries = 0
-        invalid_entries = 0
-        missing_files = 0
-        modified_files = 0
-        
-        for entry in self.entries.values():
-            full_path = self.repo_path / entry.path
-            
-            if not full_path.exists():
-                missing_files += 1
-                invalid_entries += 1
-            elif self.is_file_modified(entry.path):
-                modified_files += 1
-                invalid_entries += 1
-            else:
-                valid_entries += 1
+        changed = self._find_modified(self.entries.values(), trust_stat)
+        missing_files = sum(1 for path in changed if not (self.repo_path / path).exists())
+        modified_files = len(changed) - missing_files
+        invalid_entries = len(changed)
+        valid_entries = len(self.entries) - invalid_entries
         
         return {
             'total_entries': len(self.entries),
@@ -5,31 +5,161 @@ Merkle Tree实现
 """
 
 import os
-import sys
-from typing import Dict, List, Optional, Set, Tuple
+import re
+import json
+import time
+from itertools import chain
+from typing import Dict, List, Optional, Pattern, Set, Tuple
 from pathlib import Path
+from dataclasses import dataclass, field
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from objects.blob import Blob
-from objects.tree import Tree, TreeEntry
-from objects.commit import Commit
-from core.hash import HashCalculator
+from ..objects.blob import Blob
+from ..objects.tree import Tree, TreeEntry
+from ..objects.commit import Commit
+from .hash import HashCalculator
+from .fileio import atomic_write
+
+
+def _compile_ignore_patterns(ignore_patterns: List[str]) -> Tuple[frozenset, Optional[Pattern]]:
+    """
+    预编译忽略模式
+    
+    模式按子串匹配文件名。与模式完全相同的名字（最常见的情况）用集合O(1)判断，
+    其余情况用一个预编译的多选正则一次匹配所有模式。
+    
+    Args:
+        ignore_patterns: 忽略的文件模式
+        
+    Returns:
+        (精确名称集合, 子串匹配正则) 元组，没有模式时正则为None
+    """
+    exact = frozenset(ignore_patterns)
+    regex = re.compile('|'.join(map(re.escape, ignore_patterns))) if ignore_patterns else None
+    return exact, regex
+
+
+def _commit_time_ns() -> int:
+    """
+    获取提交时间（纳秒时间戳）
+    
+    设置了SOURCE_DATE_EPOCH环境变量时使用该时间，便于生成可复现的提交
+    """
+    source_date_epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if source_date_epoch:
+        return int(source_date_epoch) * 1_000_000_000
+    return time.time_ns()
+
+
+class _BlobHashCache:
+    """
+    按文件stat缓存Blob哈希，保存在.pygit/tree_cache.json中
+    
+    与索引的判定规则一致：mtime、大小、inode、ctime都未变化，
+    且文件mtime早于缓存写入时间（非racy）时才复用记录的哈希
+    """
+    
+    def __init__(self, cache_file: str):
+        """
+        初始化并加载缓存
+        
+        Args:
+            cache_file: 缓存文件路径
+        """
+        self.cache_file = cache_file
+        self._entries: Dict[str, list] = {}
+        self._written_ns = 0
+        self._current: Dict[str, list] = {}
+        self._has_racy = False
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                self._written_ns = os.fstat(f.fileno()).st_mtime_ns
+                self._entries = json.loads(f.read())
+        except (OSError, ValueError):
+            self._entries = {}
+    
+    @staticmethod
+    def _stat_key(stat: os.stat_result) -> list:
+        """提取判断文件是否变化所用的stat字段"""
+        return [stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns]
+    
+    def lookup(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """
+        查找文件的Blob哈希
+        
+        Args:
+            path: 文件相对路径
+            stat: 文件的stat结果
+            
+        Returns:
+            文件未变化时返回缓存的哈希，否则返回None
+        """
+        record = self._entries.get(path)
+        key = self._stat_key(stat)
+        if record is None or record[:4] != key:
+            return None
+        if key[0] >= self._written_ns:
+            # 与缓存同一时刻写入的文件需要重新计算，之后重写缓存使其不再racy
+            self._has_racy = True
+            return None
+        self._current[path] = record
+        return record[4]
+    
+    def record(self, path: str, stat: os.stat_result, blob_hash: str) -> None:
+        """
+        记录文件的Blob哈希
+        
+        Args:
+            path: 文件相对路径
+            stat: 文件的stat结果
+            blob_hash: Blob哈希
+        """
+        self._current[path] = self._stat_key(stat) + [blob_hash]
+    
+    def save(self) -> None:
+        """保存本次构建中出现的文件记录，已删除文件的记录随之清除"""
+        if self._current == self._entries and not self._has_racy:
+            return
+        atomic_write(self.cache_file, json.dumps(self._current, separators=(',', ':')).encode('utf-8'))
+
+
+@dataclass
+class Diff:
+    """Tree差异结果"""
+    added: List[str] = field(default_factory=list)       # 新增的文件
+    removed: List[str] = field(default_factory=list)     # 删除的文件
+    modified: List[str] = field(default_factory=list)    # 修改的文件
+    renamed: List[Tuple[str, str]] = field(default_factory=list)  # 重命名的文件: (原路径, 新路径)
+    
+    def __bool__(self) -> bool:
+        """是否存在差异"""
+        return bool(self.added or self.removed or self.modified or self.renamed)
+    
+    def __getitem__(self, key: str) -> List[str]:
+        """兼容字典式访问，如 diff['added']"""
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+
+# 空文件的Blob哈希；空文件彼此内容相同，不作为重命名配对
+_EMPTY_BLOB_HASH = Blob(b'').hash
 
 
 class MerkleTree:
     """Merkle Tree管理器"""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, odb=None):
         """
         初始化Merkle Tree管理器
         
         Args:
             repo_path: 仓库路径
+            odb: 对象数据库，用于读取已存储的子Tree（可选）
         """
         self.repo_path = Path(repo_path)
         self.hash_calculator = HashCalculator()
+        self.odb = odb
     
     def build_tree_from_directory(self, directory: str, ignore_patterns: Optional[List[str]] = None) -> Tree:
         """
@@ -50,34 +180,91 @@ class MerkleTree:
             raise FileNotFoundError(f"目录不存在: {directory}")
         
         root_tree = Tree()
-        self._build_tree_recursive(directory_path, root_tree, ignore_patterns)
+        ignore = _compile_ignore_patterns(ignore_patterns)
+        subtrees = []
+        self._build_tree_recursive(str(directory_path), root_tree, ignore, subtrees)
+        Tree.compute_hashes(subtrees)
         
         return root_tree
     
-    def _build_tree_recursive(self, current_path: Path, parent_tree: Tree, ignore_patterns: List[str]) -> None:
+    def build_tree_cached(self, ignore_patterns: Optional[List[str]] = None) -> Tree:
+        """
+        从仓库工作目录构建Merkle Tree，复用上次构建时缓存的Blob哈希
+        
+        结果与build_tree_from_directory相同，但stat未变化的文件不再读取和计算内容
+        
+        Args:
+            ignore_patterns: 忽略的文件模式
+            
+        Returns:
+            构建的Tree对象
+        """
+        if ignore_patterns is None:
+            ignore_patterns = ['.git', '.pygit', '__pycache__', '.DS_Store']
+        
+        cache = _BlobHashCache(str(self.repo_path / '.pygit' / 'tree_cache.json'))
+        root_tree = Tree()
+        ignore = _compile_ignore_patterns(ignore_patterns)
+        subtrees = []
+        self._build_tree_recursive(str(self.repo_path), root_tree, ignore, subtrees, cache)
+        Tree.compute_hashes(subtrees)
+        cache.save()
+        
+        return root_tree
+    
+    def _build_tree_recursive(self, current_path: str, parent_tree: Tree,
+                              ignore: Tuple[frozenset, Optional[Pattern]], subtrees: List[Tree],
+                              cache: Optional[_BlobHashCache] = None, prefix: str = '') -> None:
         """
         递归构建Tree结构
         
         Args:
             current_path: 当前路径
             parent_tree: 父Tree对象
-            ignore_patterns: 忽略的文件模式
+            ignore: 预编译的忽略模式（见 _compile_ignore_patterns）
+            subtrees: 收集新构建的子Tree，哈希在构建完成后批量计算
+            cache: Blob哈希缓存（可选）
+            prefix: 当前目录相对根目录的路径，用作缓存的键
         """
-        for item in current_path.iterdir():
-            # 跳过忽略的文件/目录
-            if any(pattern in item.name for pattern in ignore_patterns):
-                continue
-            
-            if item.is_file():
-                # 创建Blob对象
-                blob = Blob.from_file(str(item))
-                parent_tree.add_blob(blob, item.name)
-            
-            elif item.is_dir():
-                # 创建子Tree对象
-                subtree = Tree()
-                self._build_tree_recursive(item, subtree, ignore_patterns)
-                parent_tree.add_tree(subtree, item.name)
+        exact, regex = ignore
+        children = []  # 按遍历顺序记录 (名称, Blob、Tree或缓存的Blob哈希)
+        stats = {}  # 需要写入缓存的Blob: 名称 -> stat结果
+        with os.scandir(current_path) as it:
+            for item in it:
+                # 跳过忽略的文件/目录
+                name = item.name
+                if name in exact or (regex is not None and regex.search(name)):
+                    continue
+                
+                if item.is_file():
+                    if cache is not None:
+                        stat = item.stat()
+                        blob_hash = cache.lookup(prefix + name, stat)
+                        if blob_hash is not None:
+                            children.append((name, blob_hash))
+                            continue
+                        stats[name] = stat
+                    
+                    # 创建Blob对象，哈希在本目录遍历完后批量计算
+                    children.append((name, Blob.from_file(item.path)))
+                
+                elif item.is_dir():
+                    # 创建子Tree对象
+                    subtree = Tree()
+                    self._build_tree_recursive(item.path, subtree, ignore, subtrees, cache, prefix + name + '/')
+                    subtrees.append(subtree)
+                    children.append((name, subtree))
+        
+        Blob.compute_hashes([child for _, child in children if isinstance(child, Blob)])
+        for name, child in children:
+            if isinstance(child, str):
+                parent_tree.add_entry(TreeEntry.get("100644", 'blob', child, name))
+            elif isinstance(child, Blob):
+                parent_tree.add_blob(child, name)
+                if name in stats:
+                    cache.record(prefix + name, stats[name], child.hash)
+            else:
+                parent_tree.add_tree(child, name)
     
     def build_tree_from_files(self, files: Dict[str, str]) -> Tree:
         """
@@ -97,7 +284,9 @@ class MerkleTree:
             self._add_file_to_structure(path_structure, file_path, content)
         
         # 递归构建Tree
-        self._build_tree_from_structure(path_structure, root_tree)
+        subtrees = []
+        self._build_tree_from_structure(path_structure, root_tree, subtrees)
+        Tree.compute_hashes(subtrees)
         
         return root_tree
     
@@ -124,105 +313,184 @@ class MerkleTree:
             current_level['__files__'] = {}
         current_level['__files__'][filename] = content
     
-    def _build_tree_from_structure(self, structure: Dict, tree: Tree) -> None:
+    def _build_tree_from_structure(self, structure: Dict, tree: Tree, subtrees: List[Tree]) -> None:
         """
         从路径结构构建Tree
         
         Args:
             structure: 路径结构字典
             tree: Tree对象
+            subtrees: 收集新构建的子Tree，哈希在构建完成后批量计算
         """
         for key, value in structure.items():
             if key == '__files__':
-                # 处理文件
-                for filename, content in value.items():
-                    blob = Blob(content)
+                # 处理文件，批量计算哈希
+                blobs = [(filename, Blob(content)) for filename, content in value.items()]
+                Blob.compute_hashes([blob for _, blob in blobs])
+                for filename, blob in blobs:
                     tree.add_blob(blob, filename)
             else:
                 # 处理子目录
                 subtree = Tree()
-                self._build_tree_from_structure(value, subtree)
+                self._build_tree_from_structure(value, subtree, subtrees)
                 tree.add_tree(subtree, key)
+                subtrees.append(subtree)
     
-    def compare_trees(self, tree1: Tree, tree2: Tree) -> Dict:
+    def compare_trees(self, tree1: Tree, tree2: Tree) -> Diff:
         """
         比较两个Tree的差异
         
+        利用Merkle Tree的性质：哈希相同的（子）Tree内容必然相同，直接跳过；
+        只对哈希不同的子Tree递归比较。内容相同的删除文件和新增文件配对为重命名。
+        
         Args:
             tree1: 第一个Tree对象
             tree2: 第二个Tree对象
             
         Returns:
-            差异结果字典
+            差异结果，无差异时为假值
         """
-        differences = {
-            'added': [],      # 新增的文件
-            'removed': [],    # 删除的文件
-            'modified': [],   # 修改的文件
-            'renamed': []     # 重命名的文件
-        }
+        differences = Diff()
+        removed_blobs: Dict[str, List[str]] = {}
+        added_blobs: Dict[str, List[str]] = {}
         
-        entries1 = {entry.name: entry for entry in tree1.get_entries()}
-        entries2 = {entry.name: entry for entry in tree2.get_entries()}
+        self._compare_trees_into(tree1, tree2, '', differences, removed_blobs, added_blobs)
+        self._detect_renames(differences, removed_blobs, added_blobs)
+        return differences
+    
+    @staticmethod
+    def _detect_renames(differences: Diff, removed_blobs: Dict[str, List[str]],
+                        added_blobs: Dict[str, List[str]]) -> None:
+        """
+        把Blob哈希相同的删除文件和新增文件配对为重命名
         
-        names1 = set(entries1.keys())
-        names2 = set(entries2.keys())
+        同一内容有多个候选时按路径顺序一一配对，多出的仍记为删除或新增
+        整个新增或删除的目录不展开，其中的文件不参与配对
         
-        # 查找新增的文件
-        for name in names2 - names1:
-            entry = entries2[name]
-            if entry.obj_type == 'blob':
-                differences['added'].append(name)
-            else:
-                differences['added'].append(name + '/')
+        Args:
+            differences: 差异结果，配对的路径从removed/added移到renamed
+            removed_blobs: 删除的文件，Blob哈希 -> 路径列表
+            added_blobs: 新增的文件，Blob哈希 -> 路径列表
+        """
+        pairs = []
+        for blob_hash, old_paths in removed_blobs.items():
+            new_paths = added_blobs.get(blob_hash)
+            if new_paths and blob_hash != _EMPTY_BLOB_HASH:
+                pairs.extend(zip(old_paths, new_paths))
+        if not pairs:
+            return
+        
+        pairs.sort()
+        old_paths = {old for old, _ in pairs}
+        new_paths = {new for _, new in pairs}
+        differences.removed = [path for path in differences.removed if path not in old_paths]
+        differences.added = [path for path in differences.added if path not in new_paths]
+        differences.renamed = pairs
+    
+    def _compare_trees_into(self, tree1: Tree, tree2: Tree, prefix: str, differences: Diff,
+                            removed_blobs: Dict[str, List[str]],
+                            added_blobs: Dict[str, List[str]]) -> None:
+        """
+        按路径顺序处理两个Tree中有差异的条目，把差异写入differences
         
-        # 查找删除的文件
-        for name in names1 - names2:
-            entry = entries1[name]
-            if entry.obj_type == 'blob':
-                differences['removed'].append(name)
-            else:
-                differences['removed'].append(name + '/')
+        条目按Git的顺序比较：目录名视为带'/'后缀。这样深度优先输出的
+        added/removed/modified各列表本身就是按完整路径字典序排列的。
+        文件与目录互换的同名条目按一删一增处理。
         
-        # 查找修改的文件
-        for name in names1 & names2:
-            entry1 = entries1[name]
-            entry2 = entries2[name]
+        Args:
+            tree1: 第一个Tree对象
+            tree2: 第二个Tree对象
+            prefix: 当前Tree的路径前缀
+            differences: 差异结果
+            removed_blobs: 收集删除的文件，Blob哈希 -> 路径列表
+            added_blobs: 收集新增的文件，Blob哈希 -> 路径列表
+        """
+        if tree1.hash == tree2.hash:
+            return
+        
+        # 直接使用Tree内部的名称字典，按排序键建立映射
+        entries1 = {self._entry_key(entry): entry for entry in tree1.entries.values()}
+        entries2 = {self._entry_key(entry): entry for entry in tree2.entries.values()}
+        keys1 = entries1.keys()
+        keys2 = entries2.keys()
+        
+        # 只有新增、删除和哈希不同的条目需要处理：先用集合运算和推导式筛出，
+        # 再只对这些键排序，未变化的条目不进入下面的Python循环
+        changed = [key for key in keys1 & keys2 if entries1[key].hash != entries2[key].hash]
+        
+        for key in sorted(chain(keys1 - keys2, keys2 - keys1, changed)):
+            entry1 = entries1.get(key)
+            entry2 = entries2.get(key)
             
-            if entry1.hash != entry2.hash:
+            if entry2 is None:
+                # 删除的文件
+                differences.removed.append(prefix + key)
                 if entry1.obj_type == 'blob':
-                    differences['modified'].append(name)
-                else:
+                    removed_blobs.setdefault(entry1.hash, []).append(prefix + key)
+            elif entry1 is None:
+                # 新增的文件
+                differences.added.append(prefix + key)
+                if entry2.obj_type == 'blob':
+                    added_blobs.setdefault(entry2.hash, []).append(prefix + key)
+            else:
+                if entry1.obj_type == 'tree':
                     # 递归比较子Tree
-                    subtree1 = self._get_subtree(tree1, name)
-                    subtree2 = self._get_subtree(tree2, name)
+                    subtree1 = self._load_subtree(tree1, entry1)
+                    subtree2 = self._load_subtree(tree2, entry2)
                     if subtree1 and subtree2:
-                        sub_diff = self.compare_trees(subtree1, subtree2)
-                        # 添加前缀
-                        for key in sub_diff:
-                            for item in sub_diff[key]:
-                                differences[key].append(f"{name}/{item}")
-        
-        return differences
+                        self._compare_trees_into(subtree1, subtree2, prefix + key, differences,
+                                                 removed_blobs, added_blobs)
+                        continue
+                
+                # 修改的文件（或无法展开的子Tree）
+                differences.modified.append(prefix + key)
+    
+    @staticmethod
+    def _entry_key(entry: TreeEntry) -> str:
+        """条目的排序键，也是它在差异结果中的相对路径：目录以'/'结尾"""
+        if entry.obj_type == 'tree':
+            return entry.name + '/'
+        return entry.name
     
-    def _get_subtree(self, tree: Tree, name: str) -> Optional[Tree]:
+    def _load_subtree(self, tree: Tree, entry: TreeEntry) -> Optional[Tree]:
         """
-        获取子Tree对象
+        按Tree条目加载子Tree对象
+        
+        新构建的Tree直接挂着子Tree对象，不必另外登记；
+        从对象数据库读出的Tree没有挂载子Tree，按哈希读取（对象数据库自带缓存）
         
         Args:
             tree: 父Tree对象
-            name: 子Tree名称
+            entry: 类型为tree的条目
             
         Returns:
             子Tree对象或None
         """
-        entry = tree.get_entry(name)
-        if entry and entry.obj_type == 'tree':
-            # 这里需要从对象数据库获取实际的Tree对象
-            # 暂时返回None，后续可以扩展
-            return None
+        subtree = tree._children.get(entry.name)
+        if subtree is not None:
+            return subtree
+        
+        if self.odb is not None and self.odb.object_exists(entry.hash):
+            return self.odb.get_object(entry.hash)
+        
         return None
     
+    def iter_subtrees(self, tree: Tree):
+        """
+        遍历Tree下所有可获取的子Tree（深度优先）
+        
+        Args:
+            tree: Tree对象
+            
+        Yields:
+            子Tree对象
+        """
+        for entry in tree.get_tree_entries():
+            subtree = self._load_subtree(tree, entry)
+            if subtree is not None:
+                yield subtree
+                yield from self.iter_subtrees(subtree)
+    
     def find_changed_files(self, old_tree: Tree, new_tree: Tree) -> List[str]:
         """
         查找变更的文件
@@ -238,8 +506,9 @@ class MerkleTree:
         changed_files = []
         
         # 添加所有类型的变更
-        for change_type in ['added', 'removed', 'modified']:
-            changed_files.extend(differences[change_type])
+        changed_files.extend(differences.added)
+        changed_files.extend(differences.removed)
+        changed_files.extend(differences.modified)
         
         return changed_files
     
@@ -351,9 +620,11 @@ class MerkleTree:
             是否完整
         """
         try:
+            tree_hash = tree.hash
+            
             # 验证Tree自身的哈希
-            calculated_hash = self.hash_calculator.hash_object('tree', tree._get_content())
-            if tree.hash != calculated_hash:
+            calculated_hash = self.hash_calculator.hash_object('tree', tree._get_content_bytes())
+            if tree_hash != calculated_hash:
                 return False
             
             # 验证所有条目
@@ -382,15 +653,13 @@ class MerkleTree:
         Returns:
             创建的Commit对象
         """
-        from datetime import datetime
-        
         commit = Commit(
             tree_hash=tree.hash,
             parent_hash=parent_commit.hash if parent_commit else None,
             author=author,
             committer=committer,
             message=message,
-            timestamp=datetime.now()
+            timestamp=_commit_time_ns()
         )
         
         return commit
@@ -5,33 +5,76 @@
 """
 
 import os
-import sys
-import zlib
-from typing import Dict, Optional, Union, List
+import hashlib
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union, List
 from pathlib import Path
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from objects.blob import Blob
-from objects.tree import Tree
-from objects.commit import Commit
-from objects.tag import Tag
+from ..objects.blob import Blob
+from ..objects.tree import Tree
+from ..objects.commit import Commit
+from ..objects.tag import Tag
+
+try:
+    # zlib-ng与zlib接口和数据格式完全兼容，带有SIMD优化的校验和与解压
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖，只有配置了zstd压缩或读取zstd对象时才需要
+    zstandard = None
+
+# 支持的对象压缩格式，默认zlib；zstd需要在仓库配置中显式启用
+COMPRESSION_CODECS = ('zlib', 'zstd')
+DEFAULT_COMPRESSION = 'zlib'
+
+_ZSTD_MISSING_MESSAGE = "对象使用zstd压缩，需要安装zstandard才能读取（pip install zstandard）"
+
+# zstd帧的魔数；zlib流以0x78开头，两者不会冲突，读取时据此分派解码器
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_ZSTD_LEVEL = 3
+
+# 读取对象类型时按小块读取文件开头并解压，直到解压出头部
+_PEEK_READ_SIZE = 64
+_PEEK_HEADER_SIZE = 32
+
+# 流式解压、流式存储文件时每次读取的数据块大小
+_DECOMPRESS_CHUNK_SIZE = 64 * 1024
+
+# 批量读取对象时，对象数达到该值才使用线程池
+_PARALLEL_OBJECT_THRESHOLD = 64
+
+# 批量读取对象的线程数：CPU核数之外多留几个线程等待I/O
+_OBJECT_IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
 
 
 class ObjectDatabase:
     """对象数据库"""
     
-    def __init__(self, repo_path: str):
+    # 对象缓存的容量，以及不进入缓存的大对象阈值（序列化后字节数）。
+    # 缓存的是解压后的序列化数据，每次读取都反序列化出新实例，调用方修改对象不会影响缓存
+    OBJECT_CACHE_SIZE = 1024
+    LARGE_OBJECT_THRESHOLD = 16 * 1024
+    
+    def __init__(self, repo_path: str, compression: str = DEFAULT_COMPRESSION):
         """
         初始化对象数据库
         
         Args:
             repo_path: 仓库路径
+            compression: 写入新对象使用的压缩格式，'zlib'或'zstd'
+            
+        Raises:
+            ValueError: 压缩格式未知，或选择了zstd但未安装zstandard
         """
         self.repo_path = Path(repo_path)
         self.objects_dir = self.repo_path / '.pygit' / 'objects'
         self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._objects_dir_str = os.fspath(self.objects_dir)
         
         # 对象类型映射
         self.object_classes = {
@@ -40,11 +83,52 @@ class ObjectDatabase:
             'commit': Commit,
             'tag': Tag
         }
+        
+        # 已解码小对象的LRU缓存: 哈希 -> 对象
+        # 对象按内容寻址，写入不会使缓存失效，只有删除对象时需要移除
+        self._object_cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # 本实例确认过存在于磁盘上的对象哈希，命中时无需任何系统调用
+        self._known_hashes = set()
+        
+        # 共享的zstd解压上下文，避免每个对象重复初始化；
+        # 无论写入使用哪种格式，安装了zstandard就能读取zstd对象
+        if zstandard is not None:
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+        else:
+            self._zstd_decompressor = None
+        self._zstd_compressor = None
+        self.set_compression(compression)
     
-    def _get_object_path(self, hash_value: str) -> Path:
+    def set_compression(self, compression: str) -> None:
+        """
+        设置写入新对象使用的压缩格式，已有对象按各自的格式读取
+        
+        Args:
+            compression: 'zlib'或'zstd'
+            
+        Raises:
+            ValueError: 压缩格式未知，或选择了zstd但未安装zstandard
+        """
+        if compression not in COMPRESSION_CODECS:
+            raise ValueError(f"未知的压缩格式: {compression}")
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ValueError("配置了zstd压缩，需要安装zstandard（pip install zstandard）")
+            # 共享的zstd压缩上下文
+            self._zstd_compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+        else:
+            self._zstd_compressor = None
+        self.compression = compression
+    
+    def _get_object_path(self, hash_value: str) -> str:
         """
         获取对象存储路径
         
+        返回字符串而不是Path，省去每次查找构造Path对象的开销
+        
         Args:
             hash_value: 对象哈希值
             
@@ -55,35 +139,178 @@ class ObjectDatabase:
             raise ValueError(f"无效的哈希值: {hash_value}")
         
         # Git风格的对象存储：前两个字符作为目录名，剩余部分作为文件名
-        dir_name = hash_value[:2]
-        file_name = hash_value[2:]
+        return os.path.join(self._objects_dir_str, hash_value[:2], hash_value[2:])
+    
+    @staticmethod
+    def _path_exists(path: str) -> bool:
+        """
+        检查路径是否存在
+        
+        直接调用os.stat，省去额外的封装开销
+        
+        Args:
+            path: 要检查的路径
+            
+        Returns:
+            路径是否存在
+        """
+        try:
+            os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        return True
+    
+    @staticmethod
+    def _write_object_file(object_path: str, data: bytes) -> None:
+        """
+        写入对象文件
         
-        return self.objects_dir / dir_name / file_name
+        init()已预先创建全部256个子目录，这里直接打开文件；只有子目录不存在
+        （旧仓库或被cleanup删除）时才创建目录后重试
+        
+        Args:
+            object_path: 对象存储路径
+            data: 压缩后的对象数据
+        """
+        flags = os.O_CREAT | os.O_WRONLY | os.O_TRUNC
+        try:
+            fd = os.open(object_path, flags, 0o644)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            fd = os.open(object_path, flags, 0o644)
+        
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
     
     def _compress_object(self, data: bytes) -> bytes:
         """
         压缩对象数据
         
+        配置了zstd时使用zstd压缩，否则使用zlib
+        
         Args:
             data: 原始数据
             
         Returns:
             压缩后的数据
         """
+        if self._zstd_compressor is not None:
+            return self._zstd_compressor.compress(data)
         return zlib.compress(data)
     
+    def _compressobj(self, size: int):
+        """
+        创建增量压缩器，用于分块压缩对象数据
+        
+        Args:
+            size: 原始数据的总字节数（写入zstd帧头）
+            
+        Returns:
+            带有compress()和flush()方法的压缩器
+        """
+        if self._zstd_compressor is not None:
+            return self._zstd_compressor.compressobj(size=size)
+        return zlib.compressobj()
+    
     def _decompress_object(self, data: bytes) -> bytes:
         """
         解压缩对象数据
         
+        根据数据开头的魔数选择解码器，zlib和zstd对象可以共存
+        
         Args:
             data: 压缩的数据
             
         Returns:
             解压缩后的数据
+            
+        Raises:
+            ValueError: 对象使用zstd压缩但未安装zstandard
         """
+        if data.startswith(_ZSTD_MAGIC):
+            if self._zstd_decompressor is None:
+                raise ValueError(_ZSTD_MISSING_MESSAGE)
+            return self._zstd_decompressor.decompress(data)
         return zlib.decompress(data)
     
+    def _decompress_stream(self, f) -> bytes:
+        """
+        从文件对象流式解压对象数据
+        
+        按块读取并增量解压，不需要先把整个压缩文件读入内存
+        
+        Args:
+            f: 以二进制模式打开的对象文件
+            
+        Returns:
+            解压缩后的数据
+            
+        Raises:
+            ValueError: 对象使用zstd压缩但未安装zstandard
+        """
+        chunk = f.read(_DECOMPRESS_CHUNK_SIZE)
+        is_zstd = chunk.startswith(_ZSTD_MAGIC)
+        if is_zstd:
+            if self._zstd_decompressor is None:
+                raise ValueError(_ZSTD_MISSING_MESSAGE)
+            decompressor = self._zstd_decompressor.decompressobj()
+        else:
+            decompressor = zlib.decompressobj()
+        
+        pieces = []
+        while chunk:
+            pieces.append(decompressor.decompress(chunk))
+            chunk = f.read(_DECOMPRESS_CHUNK_SIZE)
+        
+        if not is_zstd:
+            pieces.append(decompressor.flush())
+            # zlib.decompress会拒绝截断的数据，增量解压需要自行检查
+            if not decompressor.eof:
+                raise zlib.error("对象数据不完整")
+        return b''.join(pieces)
+    
+    def _peek_type(self, object_path: str) -> str:
+        """
+        只解压对象头部，读取对象类型
+        
+        Args:
+            object_path: 对象文件路径
+            
+        Returns:
+            对象类型
+            
+        Raises:
+            ValueError: 无效的对象头部
+        """
+        with open(object_path, 'rb') as f:
+            chunk = f.read(_PEEK_READ_SIZE)
+            
+            if chunk.startswith(_ZSTD_MAGIC):
+                if self._zstd_decompressor is None:
+                    raise ValueError(_ZSTD_MISSING_MESSAGE)
+                decompress = self._zstd_decompressor.decompressobj().decompress
+            else:
+                decompressor = zlib.decompressobj()
+                decompress = lambda data: decompressor.decompress(data, _PEEK_HEADER_SIZE)
+            
+            # 动态Huffman编码的块头、尚未完整的zstd块都可能让开头几十字节解压不出数据，
+            # 继续读取直到解压出空格或NUL、数据足够长或到达文件末尾
+            prefix = b''
+            while chunk and len(prefix) < _PEEK_HEADER_SIZE:
+                prefix += decompress(chunk)
+                if b' ' in prefix or b'\0' in prefix:
+                    break
+                chunk = f.read(_PEEK_READ_SIZE)
+        
+        space_pos = prefix.find(b' ')
+        if space_pos == -1:
+            raise ValueError(f"无效的对象头部: {object_path}")
+        return prefix[:space_pos].decode('utf-8')
+    
     def store_object(self, obj: Union[Blob, Tree, Commit, Tag]) -> str:
         """
         存储对象到数据库
@@ -95,27 +322,135 @@ class ObjectDatabase:
             对象的哈希值
         """
         hash_value = obj.hash
-        object_path = self._get_object_path(hash_value)
         
         # 如果对象已存在，直接返回哈希值
-        if object_path.exists():
+        if hash_value in self._known_hashes:
+            return hash_value
+        object_path = self._get_object_path(hash_value)
+        if self._path_exists(object_path):
+            self._known_hashes.add(hash_value)
             return hash_value
         
-        # 序列化对象
-        serialized_data = obj.serialize()
+        if isinstance(obj, Blob):
+            # 头部和内容分别送入压缩器，不拼接出完整的序列化副本
+            header = obj._header_bytes
+            serialized_size = len(header) + obj.size
+            compressor = self._compressobj(serialized_size)
+            compressed_data = b''.join((compressor.compress(header),
+                                        compressor.compress(obj.content),
+                                        compressor.flush()))
+        else:
+            # 序列化对象
+            serialized_data = obj.serialize()
+            serialized_size = len(serialized_data)
+            
+            # 压缩数据
+            compressed_data = self._compress_object(serialized_data)
         
-        # 压缩数据
-        compressed_data = self._compress_object(serialized_data)
+        # 写入文件
+        self._write_object_file(object_path, compressed_data)
+        self._known_hashes.add(hash_value)
         
-        # 确保目录存在
-        object_path.parent.mkdir(parents=True, exist_ok=True)
+        # 写入后紧接着读取可以直接命中缓存；缓存的是写入的字节而不是调用方持有的对象，
+        # 之后修改该对象不会影响读取结果。Blob只在不超过阈值时才拼接出序列化数据
+        if serialized_size <= self.LARGE_OBJECT_THRESHOLD:
+            if isinstance(obj, Blob):
+                serialized_data = b''.join((header, obj.content))
+            self._cache_object(hash_value, obj.type, serialized_data)
         
-        # 写入文件
-        with open(object_path, 'wb') as f:
-            f.write(compressed_data)
+        return hash_value
+    
+    def store_file(self, file_path: str) -> str:
+        """
+        把文件内容作为Blob对象流式存储到数据库
         
+        分块读取文件，每块同时送入SHA-1和压缩器并写入临时文件，
+        内容只经过一遍，也不需要整体读入内存。算出哈希后再把临时文件移动到对象路径
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            Blob对象的哈希值
+            
+        Raises:
+            ValueError: 文件在读取过程中大小发生变化
+        """
+        with open(file_path, 'rb') as src:
+            size = os.fstat(src.fileno()).st_size
+            header = b"blob %d\0" % size
+            hasher = hashlib.sha1(header)
+            compressor = self._compressobj(len(header) + size)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=self._objects_dir_str, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    out.write(compressor.compress(header))
+                    remaining = size
+                    chunk = src.read(_DECOMPRESS_CHUNK_SIZE)
+                    while chunk:
+                        remaining -= len(chunk)
+                        hasher.update(chunk)
+                        out.write(compressor.compress(chunk))
+                        chunk = src.read(_DECOMPRESS_CHUNK_SIZE)
+                    out.write(compressor.flush())
+                if remaining != 0:
+                    raise ValueError(f"文件在读取过程中被修改: {file_path}")
+                
+                hash_value = hasher.hexdigest()
+                object_path = self._get_object_path(hash_value)
+                if hash_value in self._known_hashes or self._path_exists(object_path):
+                    os.unlink(tmp_path)
+                else:
+                    os.chmod(tmp_path, 0o644)
+                    try:
+                        os.replace(tmp_path, object_path)
+                    except FileNotFoundError:
+                        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                        os.replace(tmp_path, object_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        
+        self._known_hashes.add(hash_value)
         return hash_value
     
+    def store_objects(self, objs: Iterable[Union[Blob, Tree, Commit, Tag]]) -> List[str]:
+        """
+        批量存储对象到数据库
+        
+        先过滤已存在和重复的对象并一次性完成压缩，再依次写入
+        
+        Args:
+            objs: 要存储的对象
+            
+        Returns:
+            对象的哈希值列表，顺序与输入一致
+        """
+        hashes = []
+        pending = {}
+        for obj in objs:
+            hash_value = obj.hash
+            hashes.append(hash_value)
+            if hash_value in pending or hash_value in self._known_hashes:
+                continue
+            object_path = self._get_object_path(hash_value)
+            if self._path_exists(object_path):
+                self._known_hashes.add(hash_value)
+            else:
+                serialized_data = obj.serialize()
+                pending[hash_value] = (object_path, self._compress_object(serialized_data))
+                self._cache_object(hash_value, obj.type, serialized_data)
+        
+        for hash_value, (object_path, compressed_data) in pending.items():
+            self._write_object_file(object_path, compressed_data)
+            self._known_hashes.add(hash_value)
+        
+        return hashes
+    
     def get_object(self, hash_value: str) -> Union[Blob, Tree, Commit, Tag]:
         """
         从数据库获取对象
@@ -130,17 +465,61 @@ class ObjectDatabase:
             FileNotFoundError: 对象不存在
             ValueError: 无效的对象类型
         """
-        object_path = self._get_object_path(hash_value)
+        cached = self._object_cache.get(hash_value)
+        if cached is not None:
+            self._object_cache.move_to_end(hash_value)
+            self._cache_hits += 1
+            obj_type, serialized_data = cached
+        else:
+            self._cache_misses += 1
+            obj_type, serialized_data = self.get_raw(hash_value)
+            self._cache_object(hash_value, obj_type, serialized_data)
+        
+        return self.object_classes[obj_type].deserialize(serialized_data)
+    
+    def _read_object(self, hash_value: str) -> Tuple[Union[Blob, Tree, Commit, Tag], int]:
+        """
+        从磁盘读取并反序列化对象，不经过缓存
         
-        if not object_path.exists():
-            raise FileNotFoundError(f"对象不存在: {hash_value}")
+        不修改任何实例状态，可以在多个线程中同时调用
         
-        # 读取压缩数据
-        with open(object_path, 'rb') as f:
-            compressed_data = f.read()
+        Args:
+            hash_value: 对象哈希值
+            
+        Returns:
+            (对象实例, 序列化后的字节数)
+            
+        Raises:
+            FileNotFoundError: 对象不存在
+            ValueError: 无效的对象类型
+        """
+        obj_type, serialized_data = self.get_raw(hash_value)
+        obj_class = self.object_classes[obj_type]
+        return obj_class.deserialize(serialized_data), len(serialized_data)
+    
+    def get_raw(self, hash_value: str) -> Tuple[str, bytes]:
+        """
+        读取对象的类型和解压后的序列化数据，不反序列化
         
-        # 解压缩数据
-        serialized_data = self._decompress_object(compressed_data)
+        Args:
+            hash_value: 对象哈希值
+            
+        Returns:
+            (对象类型, 序列化数据)，序列化数据包含对象头部
+            
+        Raises:
+            FileNotFoundError: 对象不存在
+            ValueError: 无效的对象类型
+        """
+        object_path = self._get_object_path(hash_value)
+        
+        # 边读取边解压，直接打开而不预先检查存在性
+        try:
+            f = open(object_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"对象不存在: {hash_value}") from None
+        with f:
+            serialized_data = self._decompress_stream(f)
         
         # 解析对象类型
         null_pos = serialized_data.find(b'\0')
@@ -154,12 +533,42 @@ class ObjectDatabase:
         
         obj_type = parts[0]
         
-        # 根据类型反序列化对象
         if obj_type not in self.object_classes:
             raise ValueError(f"未知的对象类型: {obj_type}")
         
-        obj_class = self.object_classes[obj_type]
-        return obj_class.deserialize(serialized_data)
+        return obj_type, serialized_data
+    
+    def _cache_object(self, hash_value: str, obj_type: str, serialized_data: bytes) -> None:
+        """
+        将对象的序列化数据放入LRU缓存
+        
+        Args:
+            hash_value: 对象哈希值
+            obj_type: 对象类型
+            serialized_data: 解压后的序列化数据
+        """
+        # 大对象不缓存，避免占用过多内存
+        if len(serialized_data) > self.LARGE_OBJECT_THRESHOLD:
+            return
+        self._object_cache[hash_value] = (obj_type, serialized_data)
+        self._object_cache.move_to_end(hash_value)
+        if len(self._object_cache) > self.OBJECT_CACHE_SIZE:
+            self._object_cache.popitem(last=False)
+    
+    def cache_stats(self) -> Dict:
+        """
+        获取对象缓存的统计信息
+        
+        Returns:
+            包含命中次数、未命中次数、命中率和当前缓存对象数的字典
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'hit_rate': self._cache_hits / lookups if lookups else 0.0,
+            'size': len(self._object_cache)
+        }
     
     def object_exists(self, hash_value: str) -> bool:
         """
@@ -171,8 +580,12 @@ class ObjectDatabase:
         Returns:
             对象是否存在
         """
-        object_path = self._get_object_path(hash_value)
-        return object_path.exists()
+        if hash_value in self._known_hashes:
+            return True
+        if self._path_exists(self._get_object_path(hash_value)):
+            self._known_hashes.add(hash_value)
+            return True
+        return False
     
     def delete_object(self, hash_value: str) -> bool:
         """
@@ -185,17 +598,20 @@ class ObjectDatabase:
             是否成功删除
         """
         object_path = self._get_object_path(hash_value)
+        self._object_cache.pop(hash_value, None)
+        self._known_hashes.discard(hash_value)
         
-        if object_path.exists():
-            object_path.unlink()
-            # 尝试删除空目录
-            try:
-                object_path.parent.rmdir()
-            except OSError:
-                pass  # 目录不为空，忽略错误
-            return True
+        try:
+            os.unlink(object_path)
+        except FileNotFoundError:
+            return False
         
-        return False
+        # 尝试删除空目录
+        try:
+            os.rmdir(os.path.dirname(object_path))
+        except OSError:
+            pass  # 目录不为空，忽略错误
+        return True
     
     def list_objects(self, obj_type: Optional[str] = None) -> List[str]:
         """
@@ -209,23 +625,22 @@ class ObjectDatabase:
         """
         objects = []
         
-        # 遍历对象目录
-        for dir_path in self.objects_dir.iterdir():
-            if not dir_path.is_dir():
-                continue
+        # 遍历对象目录，scandir的类型判断通常无需额外stat
+        with os.scandir(self.objects_dir) as dir_entries:
+            dir_list = [entry for entry in dir_entries if entry.is_dir(follow_symlinks=False)]
+        
+        for dir_entry in dir_list:
+            with os.scandir(dir_entry.path) as file_entries:
+                file_names = [entry.name for entry in file_entries if entry.is_file(follow_symlinks=False)]
             
-            for file_path in dir_path.iterdir():
-                if not file_path.is_file():
-                    continue
-                
+            for file_name in file_names:
                 # 构建哈希值
-                hash_value = dir_path.name + file_path.name
+                hash_value = dir_entry.name + file_name
                 
-                # 如果指定了类型，检查对象类型
+                # 如果指定了类型，只解压头部检查对象类型
                 if obj_type:
                     try:
-                        obj = self.get_object(hash_value)
-                        if obj.type != obj_type:
+                        if self._peek_type(os.path.join(dir_entry.path, file_name)) != obj_type:
                             continue
                     except Exception:
                         continue
@@ -252,8 +667,8 @@ class ObjectDatabase:
                 'hash': hash_value,
                 'type': obj.type,
                 'size': obj.size,
-                'path': str(object_path),
-                'exists': object_path.exists()
+                'path': object_path,
+                'exists': True
             }
         except Exception as e:
             return {
@@ -275,25 +690,72 @@ class ObjectDatabase:
             'total_size': 0
         }
         
-        for hash_value in self.list_objects():
-            try:
-                obj = self.get_object(hash_value)
-                object_path = self._get_object_path(hash_value)
-                file_size = object_path.stat().st_size
-                
-                stats['total_objects'] += 1
-                stats['total_size'] += file_size
-                
-                obj_type = obj.type
-                if obj_type not in stats['objects_by_type']:
-                    stats['objects_by_type'][obj_type] = 0
-                stats['objects_by_type'][obj_type] += 1
-                
-            except Exception:
+        for info in self._map_objects(self._stat_one, self.list_objects()):
+            if info is None:
                 continue
+            
+            obj_type, file_size = info
+            stats['total_objects'] += 1
+            stats['total_size'] += file_size
+            
+            if obj_type not in stats['objects_by_type']:
+                stats['objects_by_type'][obj_type] = 0
+            stats['objects_by_type'][obj_type] += 1
         
         return stats
     
+    def _stat_one(self, hash_value: str) -> Optional[Tuple[str, int]]:
+        """
+        读取单个对象的类型和文件大小
+        
+        Args:
+            hash_value: 对象哈希值
+            
+        Returns:
+            (对象类型, 文件大小)，对象无法读取时返回None
+        """
+        try:
+            object_path = self._get_object_path(hash_value)
+            return self._peek_type(object_path), os.stat(object_path).st_size
+        except Exception:
+            return None
+    
+    def _verify_one(self, hash_value: str) -> bool:
+        """
+        验证单个对象的内容与哈希值是否一致
+        
+        Args:
+            hash_value: 对象哈希值
+            
+        Returns:
+            对象是否完好
+        """
+        try:
+            obj, _ = self._read_object(hash_value)
+        except Exception:
+            return False
+        return obj.hash == hash_value
+    
+    @staticmethod
+    def _map_objects(func: Callable[[str], Any], hashes: List[str]) -> Iterable[Any]:
+        """
+        对每个对象执行func，对象较多时用线程池并行
+        
+        zlib解压和SHA-1计算会释放GIL，多线程可以利用多核；读取对象文件时
+        线程阻塞在I/O上，线程数多于CPU核数可以让多个读请求同时在途
+        
+        Args:
+            func: 以对象哈希值为参数的函数，不能修改共享状态
+            hashes: 对象哈希值列表
+            
+        Returns:
+            与hashes顺序一致的结果
+        """
+        if len(hashes) < _PARALLEL_OBJECT_THRESHOLD:
+            return map(func, hashes)
+        with ThreadPoolExecutor(max_workers=_OBJECT_IO_WORKERS) as executor:
+            return list(executor.map(func, hashes, chunksize=32))
+    
     def verify_integrity(self) -> Dict:
         """
         验证数据库完整性
@@ -308,18 +770,14 @@ class ObjectDatabase:
             'corrupted_list': []
         }
         
-        for hash_value in self.list_objects():
+        # 逐个读取并验证哈希值，不经过对象缓存以免挤出热点对象
+        hashes = self.list_objects()
+        for hash_value, valid in zip(hashes, self._map_objects(self._verify_one, hashes)):
             results['total_objects'] += 1
             
-            try:
-                obj = self.get_object(hash_value)
-                # 验证哈希值
-                if obj.hash == hash_value:
-                    results['valid_objects'] += 1
-                else:
-                    results['corrupted_objects'] += 1
-                    results['corrupted_list'].append(hash_value)
-            except Exception:
+            if valid:
+                results['valid_objects'] += 1
+            else:
                 results['corrupted_objects'] += 1
                 results['corrupted_list'].append(hash_value)
         
@@ -330,13 +788,12 @@ class ObjectDatabase:
         清理数据库
         删除空目录
         """
-        for dir_path in self.objects_dir.iterdir():
-            if not dir_path.is_dir():
-                continue
-            
+        with os.scandir(self.objects_dir) as dir_entries:
+            dir_paths = [entry.path for entry in dir_entries if entry.is_dir(follow_symlinks=False)]
+        
+        for dir_path in dir_paths:
+            # 直接尝试删除，rmdir本身会拒绝非空目录，无需先列出内容
             try:
-                # 尝试删除空目录
-                if not any(dir_path.iterdir()):
-                    dir_path.rmdir()
+                os.rmdir(dir_path)
             except OSError:
                 pass  # 目录不为空，忽略错误
\ No newline at end of file
@@ -5,22 +5,34 @@
 """
 
 import os
-import sys
 import json
+import time
+import heapq
 from typing import Dict, List, Optional, Set
 from pathlib import Path
 from datetime import datetime
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.repository import ObjectDatabase
-from core.index import Index
-from core.merkle import MerkleTree
-from objects.blob import Blob
-from objects.tree import Tree
-from objects.commit import Commit
-from objects.tag import Tag
+from .repository import ObjectDatabase, DEFAULT_COMPRESSION
+from .index import Index
+from .merkle import MerkleTree, Diff
+from .fileio import atomic_write
+from .hash import _RACY_WINDOW_NS
+from ..objects.blob import Blob
+from ..objects.tree import Tree
+from ..objects.commit import Commit
+from ..objects.tag import Tag
+
+try:
+    # orjson解析更快，且与json.loads结果一致；写入仍用json.dumps保持文件格式不变
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _copy_status(status: Dict) -> Dict:
+    """复制状态字典，其中的文件列表也一并复制"""
+    return {key: list(value) if isinstance(value, list) else value
+            for key, value in status.items()}
 
 
 class Repository:
@@ -40,13 +52,13 @@ class Repository:
         self.is_valid_repo = self.pygit_dir.exists()
         
         if self.is_valid_repo:
+            # 加载仓库配置，对象数据库的压缩格式由配置决定
+            self.config = self._load_config()
+            
             # 初始化组件
-            self.odb = ObjectDatabase(str(self.repo_path))
+            self.odb = ObjectDatabase(str(self.repo_path), self._compression())
             self.index = Index(str(self.repo_path))
-            self.merkle_tree = MerkleTree(str(self.repo_path))
-            
-            # 加载仓库配置
-            self.config = self._load_config()
+            self.merkle_tree = MerkleTree(str(self.repo_path), self.odb)
             
             # 加载HEAD引用
             self.head = self._load_head()
@@ -56,23 +68,28 @@ class Repository:
             self.merkle_tree = None
             self.config = {}
             self.head = None
+        
+        # status()结果缓存: (状态签名, 结果)
+        self._status_cache = None
     
     def _load_config(self) -> Dict:
         """加载仓库配置"""
         config_file = self.pygit_dir / 'config'
-        if config_file.exists():
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
+        try:
+            with open(config_file, 'rb') as f:
+                return _json_loads(f.read())
+        except (ValueError, OSError):
+            return {}
+    
+    def _compression(self) -> str:
+        """获取配置的对象压缩格式，未配置时使用zlib"""
+        return self.config.get('core', {}).get('compression', DEFAULT_COMPRESSION)
     
     def _save_config(self) -> None:
         """保存仓库配置"""
         config_file = self.pygit_dir / 'config'
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
+        content = json.dumps(self.config, indent=2, ensure_ascii=False)
+        atomic_write(config_file, content.encode('utf-8'))
     
     def _load_head(self) -> Optional[str]:
         """加载HEAD引用"""
@@ -81,9 +98,9 @@ class Repository:
             try:
                 with open(head_file, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
-                    if content.startswith('ref: '):
+                    key, sep, ref_name = content.partition(' ')
+                    if sep and key == 'ref:':
                         # 分支引用
-                        ref_name = content[5:]
                         ref_file = self.pygit_dir / ref_name
                         if ref_file.exists():
                             with open(ref_file, 'r', encoding='utf-8') as ref_f:
@@ -110,6 +127,95 @@ class Repository:
         
         self.head = commit_hash
     
+    def state_signature(self) -> tuple:
+        """
+        获取仓库元数据的状态快照
+        
+        由config、index、HEAD及各分支引用文件的(mtime_ns, size)组成，
+        用于判断缓存的仓库对象是否已被其他进程修改。
+        
+        Returns:
+            状态快照元组
+        """
+        signature = []
+        for name in ('config', 'index', 'HEAD'):
+            try:
+                stat = os.stat(self.pygit_dir / name)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        
+        heads = []
+        try:
+            with os.scandir(self.pygit_dir / 'refs' / 'heads') as it:
+                for entry in it:
+                    stat = entry.stat()
+                    heads.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+        signature.append(frozenset(heads))
+        
+        return tuple(signature)
+    
+    def _worktree_scan_signature(self) -> Optional[tuple]:
+        """
+        计算工作目录的廉价状态签名
+        
+        只对文件做stat，不读取内容：将每个文件的(路径, mtime_ns, size)
+        哈希后异或到一个64位整数中，并附带文件数量。
+        跳过隐藏目录，且不跟随目录符号链接，与Index.scan_working_tree一致；
+        遍历中没有遇到的已跟踪文件（位于隐藏目录中或已删除）单独stat后计入签名，
+        这些文件的修改同样会出现在状态中。
+        
+        最近修改过的文件可能在同一个mtime刻度内再次被修改而大小不变，签名无法区分，
+        此时返回None，不使用也不写入状态缓存。
+        
+        Returns:
+            (文件数量, 异或签名) 元组；存在最近修改过的文件时返回None
+        """
+        count = 0
+        digest = 0
+        newest_ns = 0
+        unseen = set(self.index.entries)
+        stack = [(str(self.repo_path), '')]
+        
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as it:
+                for item in it:
+                    rel_path = os.path.join(prefix, item.name) if prefix else item.name
+                    
+                    if item.is_dir():
+                        if not item.name.startswith('.') and not item.is_symlink():
+                            stack.append((item.path, rel_path))
+                        continue
+                    
+                    unseen.discard(rel_path)
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        # 悬空的符号链接等无法stat的文件，只按路径计入
+                        key = (rel_path, None, None)
+                    else:
+                        key = (rel_path, stat.st_mtime_ns, stat.st_size)
+                        newest_ns = max(newest_ns, stat.st_mtime_ns, stat.st_ctime_ns)
+                    digest ^= hash(key) & 0xFFFFFFFFFFFFFFFF
+                    count += 1
+        
+        for rel_path in unseen:
+            try:
+                stat = os.stat(os.path.join(self.repo_path, rel_path))
+            except OSError:
+                key = (rel_path, None, None)
+            else:
+                key = (rel_path, stat.st_mtime_ns, stat.st_size)
+                newest_ns = max(newest_ns, stat.st_mtime_ns, stat.st_ctime_ns)
+            digest ^= hash(key) & 0xFFFFFFFFFFFFFFFF
+        
+        if time.time_ns() - newest_ns <= _RACY_WINDOW_NS:
+            return None
+        return count, digest
+    
     def init(self, bare: bool = False) -> None:
         """
         初始化仓库
@@ -124,7 +230,11 @@ class Repository:
         self.pygit_dir.mkdir(parents=True, exist_ok=True)
         
         # 创建子目录
-        (self.pygit_dir / 'objects').mkdir(parents=True, exist_ok=True)
+        objects_dir = self.pygit_dir / 'objects'
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        # 预先创建全部256个对象子目录，存储对象时不再逐个创建
+        for i in range(256):
+            (objects_dir / f'{i:02x}').mkdir(exist_ok=True)
         (self.pygit_dir / 'refs').mkdir(parents=True, exist_ok=True)
         (self.pygit_dir / 'refs' / 'heads').mkdir(parents=True, exist_ok=True)
         (self.pygit_dir / 'refs' / 'tags').mkdir(parents=True, exist_ok=True)
@@ -132,7 +242,7 @@ class Repository:
         # 初始化组件
         self.odb = ObjectDatabase(str(self.repo_path))
         self.index = Index(str(self.repo_path))
-        self.merkle_tree = MerkleTree(str(self.repo_path))
+        self.merkle_tree = MerkleTree(str(self.repo_path), self.odb)
         
         # 设置默认配置
         self.config = {
@@ -170,6 +280,29 @@ class Repository:
         self.config['user']['email'] = email
         self._save_config()
     
+    def set_config(self, section: str, key: str, value) -> None:
+        """
+        设置单个配置项，只写一次配置文件
+        
+        core.compression可设为'zlib'（默认）或'zstd'，之后写入的新对象使用该格式
+        
+        Args:
+            section: 配置节
+            key: 配置键
+            value: 配置值
+            
+        Raises:
+            ValueError: 无效的仓库，或压缩格式不可用
+        """
+        if not self.is_valid_repo:
+            raise ValueError("无效的仓库")
+        
+        if section == 'core' and key == 'compression':
+            # 先检查格式是否可用，不可用时不写入配置
+            self.odb.set_compression(value)
+        self.config.setdefault(section, {})[key] = value
+        self._save_config()
+    
     def add(self, paths: List[str]) -> None:
         """
         添加文件到暂存区
@@ -180,39 +313,65 @@ class Repository:
         if not self.is_valid_repo:
             raise ValueError("无效的仓库")
         
-        for path in paths:
-            file_path = Path(path)
-            if file_path.is_absolute():
-                # 转换为相对路径
-                try:
-                    rel_path = str(file_path.relative_to(self.repo_path))
-                except ValueError:
-                    raise ValueError(f"文件不在仓库内: {path}")
-            else:
-                rel_path = path
-            
-            full_path = self.repo_path / rel_path
-            
-            if not full_path.exists():
-                raise FileNotFoundError(f"文件不存在: {path}")
-            
-            if full_path.is_file():
-                self.index.add_file(rel_path)
-            elif full_path.is_dir():
-                # 递归添加目录
-                self._add_directory_recursive(full_path)
+        # 先更新内存中的索引，最后只写一次索引文件
+        with self.index:
+            for path in paths:
+                file_path = Path(path)
+                if file_path.is_absolute():
+                    # 转换为相对路径
+                    try:
+                        rel_path = str(file_path.relative_to(self.repo_path))
+                    except ValueError:
+                        raise ValueError(f"文件不在仓库内: {path}")
+                else:
+                    rel_path = path
+                
+                full_path = self.repo_path / rel_path
+                
+                if not full_path.exists():
+                    raise FileNotFoundError(f"文件不存在: {path}")
+                
+                if full_path.is_file():
+                    self._stage_file(rel_path)
+                elif full_path.is_dir():
+                    # 递归添加目录
+                    self._add_directory_recursive(full_path)
+    
+    def _stage_file(self, rel_path: str) -> None:
+        """
+        暂存单个文件：更新索引条目，并把文件内容作为Blob对象写入对象数据库
+        
+        Blob通过store_file流式存储，读取文件的同时计算哈希并压缩，不把整个文件读入内存
+        
+        Args:
+            rel_path: 相对仓库根目录的文件路径
+        """
+        self.index.add_file(rel_path)
+        self.odb.store_file(str(self.repo_path / rel_path))
     
     def _add_directory_recursive(self, directory: Path) -> None:
         """
         递归添加目录
         
+        使用os.scandir的显式栈遍历，文件类型来自readdir结果，相对路径由父目录前缀拼接。
+        跳过.pygit目录，不跟随目录符号链接
+        
         Args:
             directory: 目录路径
         """
-        for item in directory.rglob('*'):
-            if item.is_file():
-                rel_path = str(item.relative_to(self.repo_path))
-                self.index.add_file(rel_path)
+        rel_dir = os.path.relpath(directory, self.repo_path)
+        stack = [(str(directory), '' if rel_dir == os.curdir else rel_dir + os.sep)]
+        
+        with self.index:
+            while stack:
+                current, prefix = stack.pop()
+                with os.scandir(current) as it:
+                    for item in it:
+                        if item.is_dir(follow_symlinks=False):
+                            if item.name != '.pygit':
+                                stack.append((item.path, prefix + item.name + os.sep))
+                        elif item.is_file():
+                            self._stage_file(prefix + item.name)
     
     def add_all(self) -> None:
         """添加所有文件到暂存区"""
@@ -220,15 +379,14 @@ class Repository:
             raise ValueError("无效的仓库")
         
         # 获取所有未跟踪和修改的文件
-        untracked = self.index.get_untracked_files()
-        modified = self.index.get_modified_files()
-        
-        all_files = set(untracked) | set(modified)
-        
-        for file_path in all_files:
-            full_path = self.repo_path / file_path
-            if full_path.exists() and full_path.is_file():
-                self.index.add_file(file_path)
+        untracked, modified = self.index.scan_working_tree()
+        
+        # 两个列表都已排序且互不相交（未跟踪文件不在索引中），线性归并即可
+        with self.index:
+            for file_path in heapq.merge(untracked, modified):
+                full_path = self.repo_path / file_path
+                if full_path.exists() and full_path.is_file():
+                    self._stage_file(file_path)
     
     def commit(self, message: str, allow_empty: bool = False) -> str:
         """
@@ -247,8 +405,8 @@ class Repository:
         if not message.strip():
             raise ValueError("提交消息不能为空")
         
-        # 构建Tree
-        tree = self.merkle_tree.build_tree_from_directory(str(self.repo_path))
+        # 构建Tree，stat未变化的文件复用上次缓存的Blob哈希
+        tree = self.merkle_tree.build_tree_cached()
         
         # 检查是否有变更
         if not allow_empty and self.head:
@@ -256,7 +414,8 @@ class Repository:
             if parent_commit.tree_hash == tree.hash:
                 raise ValueError("没有变更需要提交")
         
-        # 存储Tree
+        # 存储Tree（包括所有子Tree，diff时可逐层比较）
+        self.odb.store_objects(self.merkle_tree.iter_subtrees(tree))
         self.odb.store_object(tree)
         
         # 创建Commit
@@ -288,11 +447,18 @@ class Repository:
         if not self.is_valid_repo:
             raise ValueError("无效的仓库")
         
+        # 元数据和工作目录都没有变化时直接返回上次的结果；返回副本，
+        # 调用方修改结果不会影响缓存
+        worktree_signature = self._worktree_scan_signature()
+        signature = (self.state_signature(), worktree_signature)
+        if (worktree_signature is not None and self._status_cache is not None
+                and self._status_cache[0] == signature):
+            return _copy_status(self._status_cache[1])
+        
         staged_files = self.index.get_staged_files()
-        modified_files = self.index.get_modified_files()
-        untracked_files = self.index.get_untracked_files()
+        untracked_files, modified_files = self.index.scan_working_tree()
         
-        return {
+        result = {
             'branch': self._get_current_branch(),
             'head': self.head,
             'staged_files': staged_files,
@@ -300,6 +466,9 @@ class Repository:
             'untracked_files': untracked_files,
             'is_clean': len(modified_files) == 0 and len(untracked_files) == 0
         }
+        if worktree_signature is not None:
+            self._status_cache = (signature, _copy_status(result))
+        return result
     
     def _get_current_branch(self) -> str:
         """获取当前分支名"""
@@ -308,8 +477,9 @@ class Repository:
             try:
                 with open(head_file, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
-                    if content.startswith('ref: '):
-                        return content[5:]  # 移除 'ref: ' 前缀
+                    key, sep, ref_name = content.partition(' ')
+                    if sep and key == 'ref:':
+                        return ref_name
             except IOError:
                 pass
         return 'HEAD'
@@ -331,23 +501,28 @@ class Repository:
         current_hash = self.head
         
         while current_hash and len(commits) < max_count:
+            # 只解析需要的字段，不构造Commit对象
             try:
-                commit = self.odb.get_object(current_hash)
-                commits.append({
-                    'hash': commit.hash,
-                    'tree_hash': commit.tree_hash,
-                    'parent_hash': commit.parent_hash,
-                    'author': commit.author,
-                    'message': commit.message,
-                    'timestamp': commit.timestamp
-                })
-                current_hash = commit.parent_hash
+                obj_type, data = self.odb.get_raw(current_hash)
+                if obj_type != 'commit':
+                    break
+                fields = Commit.parse_fields(data)
             except Exception:
                 break
+            
+            commits.append({
+                'hash': current_hash,
+                'tree_hash': fields['tree_hash'],
+                'parent_hash': fields['parent_hash'],
+                'author': fields['author'],
+                'message': fields['message'],
+                'timestamp': fields['timestamp']
+            })
+            current_hash = fields['parent_hash']
         
         return commits
     
-    def diff(self, commit_hash1: Optional[str] = None, commit_hash2: Optional[str] = None) -> Dict:
+    def diff(self, commit_hash1: Optional[str] = None, commit_hash2: Optional[str] = None) -> Diff:
         """
         比较差异
         
@@ -356,7 +531,7 @@ class Repository:
             commit_hash2: 第二个提交哈希
             
         Returns:
-            差异信息字典
+            差异结果，无差异时为假值
         """
         if not self.is_valid_repo:
             raise ValueError("无效的仓库")
@@ -2,6 +2,8 @@
 对象模块初始化文件
 """
 
+# core包初始化时会导入依赖objects的模块，先完成core的初始化以避免循环导入
+from .. import core  # noqa: F401
 from .blob import Blob
 from .tree import Tree
 from .commit import Commit
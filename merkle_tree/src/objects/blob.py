@@ -5,13 +5,9 @@ Blob对象用于存储文件内容，是Merkle Tree的叶子节点
 """
 
 import os
-import sys
-from typing import Union
+from typing import List, Union
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.hash import HashCalculator
+from ..core.hash import HashCalculator
 
 
 class Blob:
@@ -39,6 +35,19 @@ class Blob:
             self._hash = HashCalculator.hash_object('blob', self.content)
         return self._hash
     
+    @staticmethod
+    def compute_hashes(blobs: List['Blob']) -> None:
+        """
+        批量计算多个Blob对象的哈希值
+        
+        Args:
+            blobs: Blob对象列表，已有哈希的对象会被跳过
+        """
+        pending = [blob for blob in blobs if blob._hash is None]
+        hashes = HashCalculator.hash_objects('blob', [blob.content for blob in pending])
+        for blob, blob_hash in zip(pending, hashes):
+            blob._hash = blob_hash
+    
     @property
     def size(self) -> int:
         """获取Blob对象的大小"""
@@ -57,6 +66,11 @@ class Blob:
         """获取Blob对象的字符串内容"""
         return self.content.decode('utf-8')
     
+    @property
+    def _header_bytes(self) -> bytes:
+        """获取对象头部（"blob <大小>\0"），可与内容分开写入或送入哈希"""
+        return b"blob %d\0" % self._size
+    
     def serialize(self) -> bytes:
         """
         序列化Blob对象
@@ -64,8 +78,8 @@ class Blob:
         Returns:
             序列化后的字节数据
         """
-        header = f"blob {self.size}\0"
-        return header.encode('utf-8') + self.content
+        # 内容可能很大，序列化结果不做缓存，以免同时持有两份数据
+        return b"".join((self._header_bytes, self.content))
     
     @classmethod
     def deserialize(cls, data: bytes) -> 'Blob':
@@ -105,10 +119,13 @@ class Blob:
         Returns:
             Blob对象
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"文件不存在: {file_path}")
-        
-        with open(file_path, 'rb') as f:
+        # 直接打开文件，省去单独的存在性检查；内容读入bytes而不是映射文件，
+        # 避免工作区文件被改写或截断后Blob内容随之变化
+        try:
+            f = open(file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
+        with f:
             content = f.read()
         
         return cls(content)
@@ -144,4 +161,6 @@ class Blob:
     
     def __hash__(self) -> int:
         """哈希值"""
-        return hash(self.hash)
\ No newline at end of file
+        # 只取大小和内容开头，不触发SHA-1计算；内容相同的对象结果一致，
+        # 与基于SHA-1的__eq__保持兼容
+        return hash((self._size, self.content[:16]))
\ No newline at end of file
@@ -4,28 +4,85 @@ Commit对象实现
 Commit对象用于存储提交信息，是Merkle Tree的根节点
 """
 
-import os
 import sys
-from typing import Optional, List
-from datetime import datetime
+from typing import Dict, Optional, List, Union
+from datetime import datetime, timedelta, timezone
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.hash import HashCalculator
-from objects.tree import Tree
+from ..core.hash import HashCalculator
+from .tree import Tree
+
+# 序列化头部模板，只需填入内容长度
+_HEADER_TEMPLATE = b"commit %d\0"
+
+# 纳秒时间戳的起点，按UTC解释
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """
+    把时间格式化为"YYYY-MM-DD HH:MM:SS"
+    
+    格式固定，直接格式化各个整数字段，比strftime少一次格式串解析
+    """
+    return (f"{timestamp.year:04d}-{timestamp.month:02d}-{timestamp.day:02d} "
+            f"{timestamp.hour:02d}:{timestamp.minute:02d}:{timestamp.second:02d}")
+
+
+def _parse_timestamp(timestamp_str: str) -> datetime:
+    """
+    解析"YYYY-MM-DD HH:MM:SS"格式的时间
+    
+    标准格式直接按位置切片转换整数，不经过strptime的格式串解析；
+    其他写法（如未补零）仍交给strptime处理
+    
+    Raises:
+        ValueError: 时间格式无效
+    """
+    s = timestamp_str
+    if len(s) == 19 and s[4] == '-' and s[7] == '-' and s[10] == ' ' and s[13] == ':' and s[16] == ':':
+        return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                        int(s[11:13]), int(s[14:16]), int(s[17:19]))
+    return datetime.strptime(s, "%Y-%m-%d %H:%M:%S")
+
+
+def _parse_signature_time(signature: str) -> Optional[datetime]:
+    """
+    解析author/committer/tagger行末尾的时间
+    
+    _format_timestamp生成的时间固定占行尾19个字符，直接切片解析，
+    不必拆分整行再拼接；不是这种格式时才按空白拆分取最后两段
+    
+    Returns:
+        解析出的时间，行中不足两段时返回None
+    
+    Raises:
+        ValueError: 时间格式无效
+    """
+    if len(signature) > 19 and signature[-20] == ' ':
+        try:
+            return _parse_timestamp(signature[-19:])
+        except ValueError:
+            pass
+    
+    parts = signature.split()
+    if len(parts) < 2:
+        return None
+    return _parse_timestamp(' '.join(parts[-2:]))
 
 
 class Commit:
     """Commit对象 - 存储提交信息"""
     
+    __slots__ = ('tree_hash', 'parent_hash', 'author', 'committer', 'message', 'timestamp',
+                 '_hash', '_content', '_content_bytes')
+    
     def __init__(self, 
                  tree_hash: str,
                  parent_hash: Optional[str] = None,
                  author: str = "",
                  committer: str = "",
                  message: str = "",
-                 timestamp: Optional[datetime] = None):
+                 timestamp: Optional[Union[datetime, int]] = None):
         """
         初始化Commit对象
         
@@ -35,24 +92,32 @@ class Commit:
             author: 作者信息
             committer: 提交者信息
             message: 提交消息
-            timestamp: 提交时间
+            timestamp: 提交时间，可以是datetime或纳秒级的Unix时间戳（按UTC换算）
         """
         self.tree_hash = tree_hash
         self.parent_hash = parent_hash
-        self.author = author
-        self.committer = committer
+        # 同一个作者会出现在大量提交中，驻留后共享同一个字符串对象
+        self.author = sys.intern(author)
+        self.committer = sys.intern(committer)
         self.message = message
+        if isinstance(timestamp, int):
+            # 整数运算换算成UTC时间，避免浮点除法丢失精度、依赖本地时区
+            timestamp = _UNIX_EPOCH + timedelta(microseconds=timestamp // 1000)
         self.timestamp = timestamp or datetime.now()
         
         self._hash = None
         self._content = None
+        self._content_bytes = None
     
     @property
     def hash(self) -> str:
         """获取Commit对象的哈希值"""
-        if self._hash is None:
-            content = self._get_content()
-            self._hash = HashCalculator.hash_object('commit', content)
+        h = self._hash
+        return h if h is not None else self._compute_hash()
+    
+    def _compute_hash(self) -> str:
+        """计算并缓存哈希值"""
+        self._hash = HashCalculator.hash_object('commit', self._get_content_bytes())
         return self._hash
     
     @property
@@ -63,40 +128,29 @@ class Commit:
     @property
     def size(self) -> int:
         """获取Commit对象的大小"""
-        return len(self._get_content())
+        return len(self._get_content_bytes())
     
     def _get_content(self) -> str:
         """获取Commit对象的内容"""
         if self._content is None:
-            lines = []
-            
-            # 添加tree信息
-            lines.append(f"tree {self.tree_hash}")
-            
-            # 添加parent信息
-            if self.parent_hash:
-                lines.append(f"parent {self.parent_hash}")
+            # author和committer共用同一个时间，只格式化一次
+            timestamp_str = _format_timestamp(self.timestamp)
+            parent_line = f"parent {self.parent_hash}\n" if self.parent_hash else ""
+            author_line = f"author {self.author} {timestamp_str}\n" if self.author else ""
+            committer_line = f"committer {self.committer} {timestamp_str}\n" if self.committer else ""
             
-            # 添加author信息
-            if self.author:
-                timestamp_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                lines.append(f"author {self.author} {timestamp_str}")
-            
-            # 添加committer信息
-            if self.committer:
-                timestamp_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                lines.append(f"committer {self.committer} {timestamp_str}")
-            
-            # 添加空行分隔符
-            lines.append("")
-            
-            # 添加提交消息
-            lines.append(self.message)
-            
-            self._content = '\n'.join(lines)
+            # 头部各行之后是空行分隔符，然后是提交消息
+            self._content = (f"tree {self.tree_hash}\n{parent_line}{author_line}{committer_line}"
+                             f"\n{self.message}")
         
         return self._content
     
+    def _get_content_bytes(self) -> bytes:
+        """获取UTF-8编码后的内容，哈希、大小和序列化共用同一份编码结果"""
+        if self._content_bytes is None:
+            self._content_bytes = self._get_content().encode('utf-8')
+        return self._content_bytes
+    
     def set_tree(self, tree: Tree) -> None:
         """
         设置关联的Tree对象
@@ -107,6 +161,7 @@ class Commit:
         self.tree_hash = tree.hash
         self._hash = None  # 重置哈希
         self._content = None  # 重置内容
+        self._content_bytes = None
     
     def set_parent(self, parent_commit: 'Commit') -> None:
         """
@@ -118,6 +173,7 @@ class Commit:
         self.parent_hash = parent_commit.hash
         self._hash = None  # 重置哈希
         self._content = None  # 重置内容
+        self._content_bytes = None
     
     def get_parent_hash(self) -> Optional[str]:
         """
@@ -144,9 +200,8 @@ class Commit:
         Returns:
             序列化后的字节数据
         """
-        content = self._get_content()
-        header = f"commit {len(content)}\0"
-        return header.encode('utf-8') + content.encode('utf-8')
+        content = self._get_content_bytes()
+        return _HEADER_TEMPLATE % len(content) + content
     
     @classmethod
     def deserialize(cls, data: bytes) -> 'Commit':
@@ -159,75 +214,83 @@ class Commit:
         Returns:
             Commit对象
         """
+        fields = cls.parse_fields(data)
+        if fields['timestamp'] is None:
+            fields['timestamp'] = datetime.now()
+        
+        # 字段都已解析好，跳过__init__直接填充属性
+        commit = object.__new__(cls)
+        for name, value in fields.items():
+            setattr(commit, name, value)
+        commit._hash = None
+        commit._content = None
+        commit._content_bytes = None
+        return commit
+    
+    @staticmethod
+    def parse_fields(data: bytes) -> Dict:
+        """
+        解析序列化数据中的提交字段，不构造Commit对象
+        
+        Args:
+            data: 序列化的字节数据
+            
+        Returns:
+            包含tree_hash、parent_hash、author、committer、message、timestamp的字典
+        """
         # 查找分隔符
         null_pos = data.find(b'\0')
         if null_pos == -1:
             raise ValueError("无效的Commit对象格式")
         
         # 解析头部
-        header = data[:null_pos].decode('utf-8')
-        parts = header.split(' ')
-        if len(parts) != 2 or parts[0] != 'commit':
+        parts = data[:null_pos].split(b' ')
+        if len(parts) != 2 or parts[0] != b'commit':
             raise ValueError("无效的Commit对象头部")
         
-        # 获取内容
-        content = data[null_pos + 1:].decode('utf-8')
+        # 按字节解析内容，只解码各字段的值和提交消息，不解码整个对象
+        lines = data[null_pos + 1:].split(b'\n')
         
-        # 解析内容
-        lines = content.split('\n')
-        
-        tree_hash = ""
-        parent_hash = None
-        author = ""
-        committer = ""
         timestamp = None
-        message_lines = []
         
-        # 解析头部信息
+        # 解析头部信息：每行按第一个空格拆成键和值，同一个键以最后一次出现为准
+        headers = {}
         i = 0
         while i < len(lines) and lines[i].strip():
-            line = lines[i].strip()
-            if line.startswith('tree '):
-                tree_hash = line[5:]
-            elif line.startswith('parent '):
-                parent_hash = line[7:]
-            elif line.startswith('author '):
-                author = line[7:]
-            elif line.startswith('committer '):
-                committer = line[10:]
+            key, sep, value = lines[i].strip().partition(b' ')
+            if sep:
+                headers[key.decode('utf-8')] = value.decode('utf-8')
             i += 1
         
+        tree_hash = headers.get('tree', "")
+        parent_hash = headers.get('parent')
+        author = headers.get('author', "")
+        committer = headers.get('committer', "")
+        
         # 跳过空行
         while i < len(lines) and not lines[i].strip():
             i += 1
         
         # 获取提交消息
-        while i < len(lines):
-            message_lines.append(lines[i])
-            i += 1
-        
-        message = '\n'.join(message_lines).strip()
+        message = b'\n'.join(lines[i:]).decode('utf-8').strip()
         
         # 解析时间戳（简化处理）
         if committer:
-            parts = committer.split()
-            if len(parts) >= 2:
-                try:
-                    timestamp_str = ' '.join(parts[-2:])
-                    timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    timestamp = datetime.now()
+            try:
+                timestamp = _parse_signature_time(committer)
+            except ValueError:
+                timestamp = datetime.now()
         else:
             timestamp = datetime.now()
         
-        return cls(
-            tree_hash=tree_hash,
-            parent_hash=parent_hash,
-            author=author,
-            committer=committer,
-            message=message,
-            timestamp=timestamp
-        )
+        return {
+            'tree_hash': tree_hash,
+            'parent_hash': parent_hash,
+            'author': author,
+            'committer': committer,
+            'message': message,
+            'timestamp': timestamp
+        }
     
     def __str__(self) -> str:
         """字符串表示"""
@@ -4,21 +4,23 @@ Tag对象实现
 Tag对象用于存储标签信息，用于标记特定的Commit
 """
 
-import os
 import sys
 from typing import Optional
 from datetime import datetime
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.hash import HashCalculator
-from objects.commit import Commit
+from ..core.hash import HashCalculator
+from .commit import Commit, _format_timestamp, _parse_signature_time
+
+# 序列化头部模板，只需填入内容长度
+_HEADER_TEMPLATE = b"tag %d\0"
 
 
 class Tag:
     """Tag对象 - 存储标签信息"""
     
+    __slots__ = ('tag_name', 'target_hash', 'target_type', 'tagger', 'message', 'timestamp',
+                 '_hash', '_content', '_content_bytes')
+    
     def __init__(self,
                  tag_name: str,
                  target_hash: str,
@@ -39,20 +41,24 @@ class Tag:
         """
         self.tag_name = tag_name
         self.target_hash = target_hash
-        self.target_type = target_type
-        self.tagger = tagger
+        self.target_type = sys.intern(target_type)
+        self.tagger = sys.intern(tagger)
         self.message = message
         self.timestamp = timestamp or datetime.now()
         
         self._hash = None
         self._content = None
+        self._content_bytes = None
     
     @property
     def hash(self) -> str:
         """获取Tag对象的哈希值"""
-        if self._hash is None:
-            content = self._get_content()
-            self._hash = HashCalculator.hash_object('tag', content)
+        h = self._hash
+        return h if h is not None else self._compute_hash()
+    
+    def _compute_hash(self) -> str:
+        """计算并缓存哈希值"""
+        self._hash = HashCalculator.hash_object('tag', self._get_content_bytes())
         return self._hash
     
     @property
@@ -63,33 +69,28 @@ class Tag:
     @property
     def size(self) -> int:
         """获取Tag对象的大小"""
-        return len(self._get_content())
+        return len(self._get_content_bytes())
     
     def _get_content(self) -> str:
         """获取Tag对象的内容"""
         if self._content is None:
-            lines = []
-            
-            # 添加对象信息
-            lines.append(f"object {self.target_hash}")
-            lines.append(f"type {self.target_type}")
-            lines.append(f"tag {self.tag_name}")
-            
-            # 添加tagger信息
+            tagger_line = ""
             if self.tagger:
-                timestamp_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                lines.append(f"tagger {self.tagger} {timestamp_str}")
-            
-            # 添加空行分隔符
-            lines.append("")
+                timestamp_str = _format_timestamp(self.timestamp)
+                tagger_line = f"tagger {self.tagger} {timestamp_str}\n"
             
-            # 添加标签消息
-            lines.append(self.message)
-            
-            self._content = '\n'.join(lines)
+            # 头部各行之后是空行分隔符，然后是标签消息
+            self._content = (f"object {self.target_hash}\ntype {self.target_type}\ntag {self.tag_name}\n"
+                             f"{tagger_line}\n{self.message}")
         
         return self._content
     
+    def _get_content_bytes(self) -> bytes:
+        """获取UTF-8编码后的内容，哈希、大小和序列化共用同一份编码结果"""
+        if self._content_bytes is None:
+            self._content_bytes = self._get_content().encode('utf-8')
+        return self._content_bytes
+    
     def set_target(self, commit: Commit) -> None:
         """
         设置目标Commit对象
@@ -101,6 +102,7 @@ class Tag:
         self.target_type = commit.type
         self._hash = None  # 重置哈希
         self._content = None  # 重置内容
+        self._content_bytes = None
     
     def serialize(self) -> bytes:
         """
@@ -109,9 +111,8 @@ class Tag:
         Returns:
             序列化后的字节数据
         """
-        content = self._get_content()
-        header = f"tag {len(content)}\0"
-        return header.encode('utf-8') + content.encode('utf-8')
+        content = self._get_content_bytes()
+        return _HEADER_TEMPLATE % len(content) + content
     
     @classmethod
     def deserialize(cls, data: bytes) -> 'Tag':
@@ -130,69 +131,57 @@ class Tag:
             raise ValueError("无效的Tag对象格式")
         
         # 解析头部
-        header = data[:null_pos].decode('utf-8')
-        parts = header.split(' ')
-        if len(parts) != 2 or parts[0] != 'tag':
+        parts = data[:null_pos].split(b' ')
+        if len(parts) != 2 or parts[0] != b'tag':
             raise ValueError("无效的Tag对象头部")
         
-        # 获取内容
-        content = data[null_pos + 1:].decode('utf-8')
-        
-        # 解析内容
-        lines = content.split('\n')
+        # 按字节解析内容，只解码各字段的值和标签消息，不解码整个对象
+        lines = data[null_pos + 1:].split(b'\n')
         
-        target_hash = ""
-        target_type = ""
-        tag_name = ""
-        tagger = ""
         timestamp = None
-        message_lines = []
         
-        # 解析头部信息
+        # 解析头部信息：每行按第一个空格拆成键和值，同一个键以最后一次出现为准
+        headers = {}
         i = 0
         while i < len(lines) and lines[i].strip():
-            line = lines[i].strip()
-            if line.startswith('object '):
-                target_hash = line[7:]
-            elif line.startswith('type '):
-                target_type = line[5:]
-            elif line.startswith('tag '):
-                tag_name = line[4:]
-            elif line.startswith('tagger '):
-                tagger = line[7:]
+            key, sep, value = lines[i].strip().partition(b' ')
+            if sep:
+                headers[key.decode('utf-8')] = value.decode('utf-8')
             i += 1
         
+        target_hash = headers.get('object', "")
+        target_type = sys.intern(headers.get('type', ""))
+        tag_name = headers.get('tag', "")
+        tagger = headers.get('tagger', "")
+        
         # 跳过空行
         while i < len(lines) and not lines[i].strip():
             i += 1
         
         # 获取标签消息
-        while i < len(lines):
-            message_lines.append(lines[i])
-            i += 1
-        
-        message = '\n'.join(message_lines).strip()
+        message = b'\n'.join(lines[i:]).decode('utf-8').strip()
         
         # 解析时间戳（简化处理）
         if tagger:
-            parts = tagger.split()
-            if len(parts) >= 2:
-                try:
-                    timestamp_str = ' '.join(parts[-2:])
-                    timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    timestamp = datetime.now()
+            try:
+                timestamp = _parse_signature_time(tagger)
+            except ValueError:
+                timestamp = datetime.now()
         else:
             timestamp = datetime.now()
         
-        return cls(
-            tag_name=tag_name,
-            target_hash=target_hash,
-            target_type=target_type,
-            tagger=tagger,
-            message=message,
-            timestamp=timestamp
-        )
+        # 字段都已解析好，跳过__init__直接填充属性
+        tag = object.__new__(cls)
+        tag.tag_name = tag_name
+        tag.target_hash = target_hash
+        tag.target_type = target_type
+        tag.tagger = tagger
+        tag.message = message
+        tag.timestamp = timestamp if timestamp is not None else datetime.now()
+        tag._hash = None
+        tag._content = None
+        tag._content_bytes = None
+        return tag
     
     def __str__(self) -> str:
         """字符串表示"""
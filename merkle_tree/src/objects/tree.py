@@ -6,53 +6,200 @@ Tree对象用于存储目录结构，是Merkle Tree的内部节点
 
 import os
 import sys
-from typing import Dict, List, Optional, Union
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from weakref import WeakValueDictionary
 
-# 添加路径以便导入模块
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.hash import HashCalculator
-from objects.blob import Blob
+from ..core.hash import HashCalculator
+from .blob import Blob
+
+# 序列化头部模板，只需填入内容长度
+_HEADER_TEMPLATE = b"tree %d\0"
+
+# 条目的模式和类型只有少数几种取值，反序列化时直接映射到共享的字符串，不必逐个解码
+_MODE_STRINGS = {mode.encode('ascii'): mode for mode in ("100644", "100755", "040000", "120000", "160000")}
+_TYPE_STRINGS = {obj_type.encode('ascii'): obj_type for obj_type in ('blob', 'tree', 'commit')}
+
+# from_directory遇到的文件达到该数量时，用线程池并行读取文件并计算哈希；
+# 读取时线程阻塞在I/O上，SHA-1计算较大的数据时会释放GIL
+_PARALLEL_FILE_THRESHOLD = 64
+_FILE_IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
 
 
-@dataclass
 class TreeEntry:
-    """Tree条目"""
-    mode: str  # 文件模式，如 "100644"（普通文件）、"100755"（可执行文件）、"040000"（目录）
-    obj_type: str  # 对象类型：blob或tree
-    hash: str  # 对象哈希
-    name: str  # 文件/目录名
+    """
+    Tree条目
+    
+    条目创建后视为不可变：内容相同的条目通过TreeEntry.get共享同一个实例，
+    需要修改时替换成新的条目
+    """
+    
+    __slots__ = ('mode', 'obj_type', 'hash', 'name', '__weakref__')
+    
+    def __init__(self, mode: str, obj_type: str, hash: str, name: str):
+        """
+        初始化Tree条目
+        
+        Args:
+            mode: 文件模式，如 "100644"（普通文件）、"100755"（可执行文件）、"040000"（目录）
+            obj_type: 对象类型：blob或tree
+            hash: 对象哈希
+            name: 文件/目录名
+        """
+        self.mode = mode
+        self.obj_type = obj_type
+        self.hash = hash
+        self.name = name
+    
+    @staticmethod
+    def get(mode: str, obj_type: str, hash: str, name: str) -> 'TreeEntry':
+        """
+        获取内容相同的共享条目，不存在时创建
+        
+        大仓库中大量Tree共享相同的条目（如未改变的子目录），共享实例可以节省内存
+        
+        Args:
+            mode: 文件模式
+            obj_type: 对象类型
+            hash: 对象哈希
+            name: 文件/目录名
+            
+        Returns:
+            TreeEntry对象
+        """
+        key = (mode, obj_type, hash, name)
+        entry = _ENTRY_INTERN.get(key)
+        if entry is None:
+            # 模式和类型取值很少，驻留后所有条目共享同一个字符串对象
+            entry = TreeEntry(sys.intern(mode), sys.intern(obj_type), hash, name)
+            _ENTRY_INTERN[key] = entry
+        return entry
     
     def __str__(self) -> str:
         return f"{self.mode} {self.obj_type} {self.hash[:8]}... {self.name}"
     
+    def __repr__(self) -> str:
+        return (f"TreeEntry(mode={self.mode!r}, obj_type={self.obj_type!r}, "
+                f"hash={self.hash!r}, name={self.name!r})")
+    
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, TreeEntry):
             return False
-        return (self.mode == other.mode and 
-                self.obj_type == other.obj_type and 
-                self.hash == other.hash and 
-                self.name == other.name)
+        # 先比较区分度最高的哈希，内容不同的条目通常第一项就不相等
+        return (self.hash == other.hash and 
+                self.name == other.name and 
+                self.mode == other.mode and 
+                self.obj_type == other.obj_type)
+    
+    def __hash__(self) -> int:
+        # 与__eq__一致，条目可以放进集合或作为字典的键
+        return hash((self.mode, self.obj_type, self.hash, self.name))
+
+
+def _hash_blob_file(file_path: str) -> str:
+    """读取文件并计算对应Blob对象的哈希值，不保留文件内容"""
+    return Blob.from_file(file_path).hash
+
+
+# 共享的Tree条目: (mode, obj_type, hash, name) -> TreeEntry，不再被引用的条目自动移除
+_ENTRY_INTERN = WeakValueDictionary()
 
 
 class Tree:
     """Tree对象 - 存储目录结构"""
     
+    __slots__ = ('entries', '_sorted_names', '_hash', '_content', '_content_bytes',
+                 '_children', '_parent')
+    
     def __init__(self):
         """初始化Tree对象"""
         self.entries: Dict[str, TreeEntry] = {}  # 文件名 -> TreeEntry
+        self._sorted_names: Optional[List[str]] = None  # 排好序的条目名称，条目增删时失效
         self._hash = None
         self._content = None
+        self._content_bytes = None
+        
+        # 通过add_tree挂载的子Tree对象（名称 -> Tree）及父节点指针。
+        # 子Tree被修改时沿父指针把祖先标记为脏，哈希在读取时才重新计算，
+        # 且只重算脏路径上的节点。
+        self._children: Dict[str, 'Tree'] = {}
+        self._parent: Optional['Tree'] = None
     
     @property
     def hash(self) -> str:
-        """获取Tree对象的哈希值"""
-        if self._hash is None:
-            content = self._get_content()
-            self._hash = HashCalculator.hash_object('tree', content)
+        """获取Tree对象的哈希值（惰性计算）"""
+        h = self._hash
+        return h if h is not None else self._compute_hash()
+    
+    def _compute_hash(self) -> str:
+        """计算并缓存哈希值"""
+        self._hash = HashCalculator.hash_object('tree', self._get_content_bytes())
         return self._hash
     
+    @staticmethod
+    def compute_hashes(trees: List['Tree']) -> None:
+        """
+        批量计算多个Tree对象的哈希值
+        
+        Tree的内容包含子Tree的哈希，因此自底向上逐层计算：
+        每一轮批量计算所有子Tree都已有哈希的Tree
+        
+        Args:
+            trees: Tree对象列表，已有哈希的对象会被跳过
+        """
+        pending = [tree for tree in trees if tree._hash is None]
+        while pending:
+            ready = []
+            waiting = []
+            for tree in pending:
+                if any(child._hash is None for child in tree._children.values()):
+                    waiting.append(tree)
+                else:
+                    ready.append(tree)
+            
+            if not ready:
+                # 剩下的Tree依赖列表之外的子Tree，生成内容时逐个计算
+                ready, waiting = waiting, []
+            
+            hashes = HashCalculator.hash_objects('tree', [tree._get_content_bytes() for tree in ready])
+            for tree, tree_hash in zip(ready, hashes):
+                tree._hash = tree_hash
+            pending = waiting
+    
+    @property
+    def dirty(self) -> bool:
+        """哈希是否需要重新计算"""
+        return self._hash is None
+    
+    def _invalidate(self) -> None:
+        """
+        标记自身及所有祖先为脏
+        
+        serialize、size等只生成内容而不计算哈希，因此不能只看_hash判断祖先是否已脏：
+        祖先缓存的内容里同样带着子Tree的旧哈希。遇到既没有哈希也没有内容缓存的祖先才停止，
+        祖先生成内容时会先计算子Tree的哈希，它的祖先因此也不会有缓存
+        """
+        node = self
+        while node is not None:
+            node._hash = None
+            node._content = None
+            node._content_bytes = None
+            parent = node._parent
+            if parent is None or (parent._hash is None and parent._content is None):
+                break
+            node = parent
+    
+    def _sync_children(self) -> None:
+        """把挂载的子Tree的当前哈希写回对应条目（只重算脏的子Tree）"""
+        entries = self.entries
+        for name, child in self._children.items():
+            entry = entries[name]
+            child_hash = child.hash
+            if entry.hash != child_hash:
+                entries[name] = TreeEntry.get(entry.mode, entry.obj_type, child_hash, name)
+    
     @property
     def type(self) -> str:
         """获取对象类型"""
@@ -61,24 +208,32 @@ class Tree:
     @property
     def size(self) -> int:
         """获取Tree对象的大小"""
-        return len(self._get_content())
+        return len(self._get_content_bytes())
     
     def _get_content(self) -> str:
         """获取Tree对象的内容"""
         if self._content is None:
-            # 按名称排序条目
-            sorted_entries = sorted(self.entries.values(), key=lambda x: x.name)
+            self._sync_children()
             
-            # 构建内容
-            lines = []
-            for entry in sorted_entries:
-                line = f"{entry.mode} {entry.obj_type} {entry.hash}\t{entry.name}"
-                lines.append(line)
+            # 按名称排序条目；只修改已有条目的哈希时沿用上次的排序结果
+            if self._sorted_names is None:
+                self._sorted_names = sorted(self.entries)
+            entries = self.entries
             
-            self._content = '\n'.join(lines)
+            # 构建内容；str.join内部会先把参数转成序列，列表推导式比生成器少一层开销
+            self._content = '\n'.join([
+                f"{entry.mode} {entry.obj_type} {entry.hash}\t{entry.name}"
+                for entry in map(entries.__getitem__, self._sorted_names)
+            ])
         
         return self._content
     
+    def _get_content_bytes(self) -> bytes:
+        """获取UTF-8编码后的内容，哈希、大小和序列化共用同一份编码结果"""
+        if self._content_bytes is None:
+            self._content_bytes = self._get_content().encode('utf-8')
+        return self._content_bytes
+    
     def add_entry(self, entry: TreeEntry) -> None:
         """
         添加条目到Tree
@@ -86,9 +241,11 @@ class Tree:
         Args:
             entry: TreeEntry对象
         """
+        self._detach_child(entry.name)
+        if entry.name not in self.entries:
+            self._sorted_names = None
         self.entries[entry.name] = entry
-        self._hash = None  # 重置哈希
-        self._content = None  # 重置内容
+        self._invalidate()  # 重置自身及祖先的哈希
     
     def add_blob(self, blob: Blob, name: str, mode: str = "100644") -> None:
         """
@@ -99,7 +256,7 @@ class Tree:
             name: 文件名
             mode: 文件模式
         """
-        entry = TreeEntry(mode=mode, obj_type='blob', hash=blob.hash, name=name)
+        entry = TreeEntry.get(mode, 'blob', blob.hash, name)
         self.add_entry(entry)
     
     def add_tree(self, tree: 'Tree', name: str, mode: str = "040000") -> None:
@@ -111,8 +268,37 @@ class Tree:
             name: 目录名
             mode: 目录模式
         """
-        entry = TreeEntry(mode=mode, obj_type='tree', hash=tree.hash, name=name)
+        # 已挂在其他Tree下的子Tree先从原父节点摘下，否则原父节点会继续持有它，
+        # 之后的修改只会传播到新父节点
+        if tree._parent is not None:
+            tree._parent._release_child(tree)
+        
+        # 子Tree的哈希此时不必计算，读取本Tree的哈希时再同步
+        entry = TreeEntry.get(mode, 'tree', tree._hash or '', name)
         self.add_entry(entry)
+        self._children[name] = tree
+        tree._parent = self
+    
+    def _detach_child(self, name: str) -> None:
+        """解除与同名子Tree对象的关联"""
+        child = self._children.pop(name, None)
+        if child is not None and child._parent is self:
+            child._parent = None
+    
+    def _release_child(self, tree: 'Tree') -> None:
+        """
+        解除与子Tree对象的关联，条目保留为它当前的哈希
+        
+        Args:
+            tree: 挂载在本Tree下的子Tree对象
+        """
+        entries = self.entries
+        for name in [name for name, child in self._children.items() if child is tree]:
+            del self._children[name]
+            entry = entries[name]
+            # 子Tree是脏的时本Tree也已经是脏的，这里只需把条目定格为当前哈希
+            entries[name] = TreeEntry.get(entry.mode, entry.obj_type, tree.hash, name)
+        tree._parent = None
     
     def remove_entry(self, name: str) -> bool:
         """
@@ -125,9 +311,10 @@ class Tree:
             是否成功移除
         """
         if name in self.entries:
+            self._detach_child(name)
             del self.entries[name]
-            self._hash = None  # 重置哈希
-            self._content = None  # 重置内容
+            self._sorted_names = None
+            self._invalidate()  # 重置自身及祖先的哈希
             return True
         return False
     
@@ -141,6 +328,8 @@ class Tree:
         Returns:
             TreeEntry对象或None
         """
+        if self._hash is None:
+            self._sync_children()
         return self.entries.get(name)
     
     def get_entries(self) -> List[TreeEntry]:
@@ -150,6 +339,8 @@ class Tree:
         Returns:
             TreeEntry列表
         """
+        if self._hash is None:
+            self._sync_children()
         return list(self.entries.values())
     
     def get_blob_entries(self) -> List[TreeEntry]:
@@ -168,6 +359,8 @@ class Tree:
         Returns:
             Tree条目列表
         """
+        if self._hash is None:
+            self._sync_children()
         return [entry for entry in self.entries.values() if entry.obj_type == 'tree']
     
     def serialize(self) -> bytes:
@@ -177,9 +370,8 @@ class Tree:
         Returns:
             序列化后的字节数据
         """
-        content = self._get_content()
-        header = f"tree {len(content)}\0"
-        return header.encode('utf-8') + content.encode('utf-8')
+        content = self._get_content_bytes()
+        return _HEADER_TEMPLATE % len(content) + content
     
     @classmethod
     def deserialize(cls, data: bytes) -> 'Tree':
@@ -198,36 +390,39 @@ class Tree:
             raise ValueError("无效的Tree对象格式")
         
         # 解析头部
-        header = data[:null_pos].decode('utf-8')
-        parts = header.split(' ')
-        if len(parts) != 2 or parts[0] != 'tree':
+        parts = data[:null_pos].split(b' ')
+        if len(parts) != 2 or parts[0] != b'tree':
             raise ValueError("无效的Tree对象头部")
         
-        # 获取内容
-        content = data[null_pos + 1:].decode('utf-8')
+        # 获取内容；按字节拆分，模式、类型和哈希都是ASCII，只有名称需要按UTF-8解码
+        content = data[null_pos + 1:]
         
-        # 创建Tree对象
+        # 创建Tree对象；新Tree没有子Tree也没有缓存的哈希，条目直接写入，
+        # 不必经过add_entry逐个解除关联和失效
         tree = cls()
+        entries = tree.entries
         
-        # 解析条目
+        # 解析条目；每个条目都会执行循环体，用到的函数预先绑定为局部变量
         if content:
-            lines = content.split('\n')
-            for line in lines:
-                if line.strip():
-                    parts = line.split('\t')
-                    if len(parts) != 2:
-                        continue
-                    
-                    obj_info = parts[0]
-                    name = parts[1]
-                    
-                    obj_parts = obj_info.split(' ')
-                    if len(obj_parts) != 3:
-                        continue
-                    
-                    mode, obj_type, obj_hash = obj_parts
-                    entry = TreeEntry(mode=mode, obj_type=obj_type, hash=obj_hash, name=name)
-                    tree.add_entry(entry)
+            get_entry = TreeEntry.get
+            mode_get = _MODE_STRINGS.get
+            type_get = _TYPE_STRINGS.get
+            for line in content.split(b'\n'):
+                # 跳过格式不对的行和空白行
+                parts = line.split(b'\t')
+                if len(parts) != 2 or not line.strip():
+                    continue
+                
+                obj_info, name = parts
+                obj_parts = obj_info.split(b' ')
+                if len(obj_parts) != 3:
+                    continue
+                
+                mode, obj_type, obj_hash = obj_parts
+                name = name.decode('utf-8')
+                entries[name] = get_entry(mode_get(mode) or mode.decode('ascii'),
+                                          type_get(obj_type) or obj_type.decode('ascii'),
+                                          obj_hash.decode('ascii'), name)
         
         return tree
     
@@ -242,24 +437,62 @@ class Tree:
         Returns:
             Tree对象
         """
+        # 先在当前线程中遍历出目录结构，文件的读取和哈希计算之后统一执行，
+        # 文件较多时并行计算
+        paths = []
+        layout = []
+        tree = cls._scan_directory(directory, paths, layout)
+        
+        if len(paths) < _PARALLEL_FILE_THRESHOLD:
+            hashes = [_hash_blob_file(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=_FILE_IO_WORKERS) as executor:
+                hashes = list(executor.map(_hash_blob_file, paths, chunksize=16))
+        
+        # 哈希算完后按遍历顺序添加条目，entries的顺序与串行构建时一致
+        for parent, children in layout:
+            for name, child in children:
+                if isinstance(child, Tree):
+                    parent.add_tree(child, name)
+                else:
+                    parent.add_entry(TreeEntry.get("100644", 'blob', hashes[child], name))
+        
+        return tree
+    
+    @classmethod
+    def _scan_directory(cls, directory: str, paths: List[str],
+                        layout: List[Tuple['Tree', List[Tuple[str, Union['Tree', int]]]]]) -> 'Tree':
+        """
+        递归遍历目录，创建子Tree并收集待计算哈希的文件
+        
+        Args:
+            directory: 目录路径
+            paths: 收集待计算哈希的文件路径
+            layout: 收集 (Tree, 按遍历顺序排列的子项)，子项为 (名称, 子Tree或文件在paths中的下标)
+            
+        Returns:
+            Tree对象（尚未添加条目）
+        """
         tree = cls()
+        children = []
         
-        if not os.path.exists(directory):
+        try:
+            it = os.scandir(directory)
+        except FileNotFoundError:
             raise FileNotFoundError(f"目录不存在: {directory}")
         
-        # 遍历目录
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            
-            if os.path.isfile(item_path):
-                # 创建Blob对象
-                blob = Blob.from_file(item_path)
-                tree.add_blob(blob, item)
-            elif os.path.isdir(item_path):
-                # 创建子Tree对象
-                subtree = cls.from_directory(item_path)
-                tree.add_tree(subtree, item)
+        # 遍历目录；DirEntry缓存了readdir返回的类型，除符号链接外判断类型不再stat
+        with it:
+            for item in it:
+                if item.is_file():
+                    children.append((item.name, len(paths)))
+                    paths.append(item.path)
+                elif item.is_dir():
+                    # 创建子Tree对象
+                    subtree = cls._scan_directory(item.path, paths, layout)
+                    children.append((item.name, subtree))
         
+        layout.append((tree, children))
         return tree
     
     def __str__(self) -> str:
@@ -0,0 +1,108 @@
+"""
+索引的测试
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.core.index import (Index, IndexEntry, _ENTRY_STRUCTS, _HEADER_STRUCT,
+                            _INDEX_SIGNATURE, _INDEX_VERSION)
+
+
+class IndexFormatTests(unittest.TestCase):
+    """二进制索引格式的读写"""
+    
+    def setUp(self):
+        self.repo_dir = Path(tempfile.mkdtemp())
+        (self.repo_dir / '.pygit').mkdir()
+        self.index_file = self.repo_dir / '.pygit' / 'index'
+    
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir)
+    
+    def test_load_version2_and_upgrade(self):
+        """版本2的索引没有ctime和inode，读取后补默认值，保存时升级为当前版本"""
+        path = 'dir/a.txt'.encode('utf-8')
+        data = _HEADER_STRUCT.pack(_INDEX_SIGNATURE, 2, 1)
+        data += _ENTRY_STRUCTS[2].pack(0o100644, 5, 1700000000.5, 0, bytes(range(20)), len(path))
+        data += path
+        self.index_file.write_bytes(data)
+        
+        index = Index(str(self.repo_dir))
+        self.assertEqual(index.entries['dir/a.txt'], IndexEntry(
+            path='dir/a.txt', mode='100644', blob_hash=bytes(range(20)).hex(),
+            size=5, mtime=1700000000.5, stage=0, ctime=0.0, ino=0))
+        
+        index.save()
+        _, version, count = _HEADER_STRUCT.unpack_from(self.index_file.read_bytes(), 0)
+        self.assertEqual((version, count), (_INDEX_VERSION, 1))
+        self.assertEqual(Index(str(self.repo_dir)).entries, index.entries)
+    
+    def test_binary_round_trip(self):
+        """保存后重新加载，所有字段原样恢复"""
+        index = Index(str(self.repo_dir))
+        entries = [
+            IndexEntry('a.txt', '100644', 'ab' * 20, 3, 1700000000.25, 0, 1700000001.5, 42),
+            IndexEntry('目录/脚本.sh', '100755', 'cd' * 20, 0, 0.0, 2),
+        ]
+        with index:
+            for entry in entries:
+                index.add_entry(entry)
+        
+        self.assertTrue(self.index_file.read_bytes().startswith(_INDEX_SIGNATURE))
+        self.assertEqual(list(Index(str(self.repo_dir)).entries.values()), entries)
+    
+    def test_truncated_index_is_discarded(self):
+        """被截断的索引文件按损坏处理，不会加载出半截条目"""
+        index = Index(str(self.repo_dir))
+        index.add_entry(IndexEntry('a.txt', '100644', 'ab' * 20, 3, 1.0))
+        self.index_file.write_bytes(self.index_file.read_bytes()[:-2])
+        
+        with mock.patch('builtins.print'):
+            self.assertEqual(Index(str(self.repo_dir)).entries, {})
+
+
+class IndexStatTests(unittest.TestCase):
+    """根据stat判断文件是否被修改"""
+    
+    def setUp(self):
+        self.repo_dir = Path(tempfile.mkdtemp())
+        (self.repo_dir / '.pygit').mkdir()
+        self.file_path = self.repo_dir / 'a.txt'
+        self.file_path.write_bytes(b'hello')
+        self.index = Index(str(self.repo_dir))
+        self.entry = self.index.add_file('a.txt')
+    
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir)
+    
+    def test_racy_entry_is_not_trusted(self):
+        """文件mtime不早于索引写入时间时，stat一致也要比较内容"""
+        stat = self.file_path.stat()
+        self.index._index_mtime = self.entry.mtime
+        self.assertIsNone(self.index._check_stat(self.entry, stat))
+        
+        self.index._index_mtime = self.entry.mtime + 10
+        self.assertFalse(self.index._check_stat(self.entry, stat))
+    
+    def test_same_size_rewrite_in_same_mtime_is_detected(self):
+        """同一mtime内改写为相同大小的内容，仍然判定为修改"""
+        stat = self.file_path.stat()
+        self.file_path.write_bytes(b'world')
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        self.assertTrue(self.index.is_file_modified('a.txt'))
+        self.assertEqual(self.index.get_modified_files(), ['a.txt'])
+    
+    def test_unchanged_file_is_clean(self):
+        """未修改的文件不出现在修改列表中"""
+        self.assertFalse(self.index.is_file_modified('a.txt'))
+        self.assertEqual(self.index.scan_working_tree(), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Merkle Tree比较的测试
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from src.core.merkle import MerkleTree
+from src.core.repository import ObjectDatabase
+
+
+class CompareTreesTests(unittest.TestCase):
+    """compare_trees的差异结果"""
+    
+    def setUp(self):
+        self.merkle = MerkleTree(tempfile.gettempdir())
+    
+    def _compare(self, files1, files2):
+        """分别构建两个Tree并比较"""
+        return self.merkle.compare_trees(self.merkle.build_tree_from_files(files1),
+                                         self.merkle.build_tree_from_files(files2))
+    
+    def test_identical_trees(self):
+        """内容相同的Tree没有差异"""
+        files = {'a.txt': '1', 'd/b.txt': '2'}
+        self.assertFalse(self._compare(files, dict(files)))
+    
+    def test_added_removed_modified(self):
+        """差异按完整路径排序，整个新增或删除的目录以'/'结尾"""
+        diff = self._compare(
+            {'a.txt': '1', 'd/b.txt': '2', 'd/c.txt': '3', 'old/x': 'x'},
+            {'a.txt': '1', 'd/b.txt': '20', 'd/e.txt': '4', 'new/y': 'y'},
+        )
+        
+        self.assertEqual(diff.added, ['d/e.txt', 'new/'])
+        self.assertEqual(diff.removed, ['d/c.txt', 'old/'])
+        self.assertEqual(diff.modified, ['d/b.txt'])
+        self.assertEqual(diff.renamed, [])
+    
+    def test_file_replaced_by_directory(self):
+        """同名的文件与目录互换按一删一增处理"""
+        diff = self._compare({'a': '1'}, {'a/b': '1'})
+        
+        self.assertEqual((diff.added, diff.removed), (['a/'], ['a']))
+    
+    def test_renames(self):
+        """内容相同的删除和新增文件配对为重命名，空文件不配对"""
+        diff = self._compare(
+            {'d/k': 'k', 'd/b.txt': 'moved', 'empty1': ''},
+            {'d/k': 'k', 'e/b.txt': 'x', 'c.txt': 'moved', 'empty2': ''},
+        )
+        
+        self.assertEqual(diff.renamed, [('d/b.txt', 'c.txt')])
+        self.assertEqual(diff.added, ['e/', 'empty2'])
+        self.assertEqual(diff.removed, ['empty1'])
+    
+    def test_stored_trees(self):
+        """从对象数据库读出的Tree没有挂载子Tree，按条目哈希读取后递归比较"""
+        repo_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, repo_dir)
+        odb = ObjectDatabase(repo_dir)
+        merkle = MerkleTree(repo_dir, odb)
+        
+        hashes = []
+        for files in ({'d/e/f.txt': '1', 'g.txt': 'x'}, {'d/e/f.txt': '2', 'g.txt': 'x'}):
+            tree = merkle.build_tree_from_files(files)
+            odb.store_objects(merkle.iter_subtrees(tree))
+            hashes.append(odb.store_object(tree))
+        
+        diff = MerkleTree(repo_dir, odb).compare_trees(*map(odb.get_object, hashes))
+        self.assertEqual(diff.modified, ['d/e/f.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
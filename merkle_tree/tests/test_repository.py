@@ -0,0 +1,118 @@
+"""
+对象数据库的测试
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core import repository
+from src.core.repository import ObjectDatabase, _ZSTD_MAGIC
+from src.objects.blob import Blob
+from src.objects.tree import Tree
+
+
+def _make_tree(*names: str) -> Tree:
+    """构建包含给定文件名的Tree，文件内容即文件名"""
+    tree = Tree()
+    for name in names:
+        tree.add_blob(Blob(name), name)
+    return tree
+
+
+class ObjectDatabaseTestCase(unittest.TestCase):
+    """在临时目录中创建对象数据库"""
+    
+    def setUp(self):
+        self.repo_dir = tempfile.mkdtemp()
+        self.odb = ObjectDatabase(self.repo_dir)
+    
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir)
+    
+    def _object_bytes(self, hash_value: str) -> bytes:
+        """读取对象文件的原始（压缩后）内容"""
+        with open(self.odb._get_object_path(hash_value), 'rb') as f:
+            return f.read()
+
+
+class ObjectCacheTests(ObjectDatabaseTestCase):
+    """对象LRU缓存"""
+    
+    def test_mutating_stored_object_does_not_leak(self):
+        """存储后修改调用方的对象，再读取得到的仍是存储时的内容"""
+        tree = _make_tree('a')
+        hash_value = self.odb.store_object(tree)
+        tree.add_blob(Blob('b'), 'b')
+        
+        self.assertEqual(self.odb.get_object(hash_value).hash, hash_value)
+    
+    def test_mutating_fetched_object_does_not_leak(self):
+        """每次读取都得到新实例，修改读取结果不影响缓存"""
+        hash_value = self.odb.store_object(_make_tree('a'))
+        first = self.odb.get_object(hash_value)
+        first.add_blob(Blob('b'), 'b')
+        second = self.odb.get_object(hash_value)
+        
+        self.assertIsNot(first, second)
+        self.assertEqual(second.hash, hash_value)
+        # 两次读取都来自存储时写入的缓存
+        self.assertEqual(self.odb.cache_stats()['misses'], 0)
+    
+    def test_cache_is_bounded(self):
+        """缓存超过容量时淘汰最久未使用的对象"""
+        self.odb.OBJECT_CACHE_SIZE = 2
+        hashes = [self.odb.store_object(_make_tree(name)) for name in 'abc']
+        for hash_value in hashes:
+            self.odb.get_object(hash_value)
+        self.odb.get_object(hashes[1])
+        
+        self.assertEqual(list(self.odb._object_cache), [hashes[2], hashes[1]])
+
+
+class CompressionTests(ObjectDatabaseTestCase):
+    """对象压缩格式的选择与读取分派"""
+    
+    def test_zlib_by_default(self):
+        """未配置时用zlib写入，即使安装了zstandard"""
+        hash_value = self.odb.store_object(Blob('hello'))
+        
+        self.assertEqual(self.odb.compression, 'zlib')
+        self.assertEqual(self._object_bytes(hash_value)[:1], b'\x78')
+    
+    def test_unknown_codec_rejected(self):
+        """未知的压缩格式直接报错"""
+        with self.assertRaises(ValueError):
+            self.odb.set_compression('lz4')
+    
+    def test_zstd_requires_zstandard(self):
+        """未安装zstandard时不能启用zstd，也不能读取zstd对象"""
+        with mock.patch.object(repository, 'zstandard', None):
+            odb = ObjectDatabase(self.repo_dir)
+            with self.assertRaises(ValueError):
+                odb.set_compression('zstd')
+            
+            hash_value = 'ab' + 'c' * 38
+            os.makedirs(os.path.dirname(odb._get_object_path(hash_value)), exist_ok=True)
+            with open(odb._get_object_path(hash_value), 'wb') as f:
+                f.write(_ZSTD_MAGIC + b'\0' * 8)
+            with self.assertRaisesRegex(ValueError, 'zstandard'):
+                odb.get_object(hash_value)
+    
+    @unittest.skipIf(repository.zstandard is None, "未安装zstandard")
+    def test_zstd_and_zlib_objects_coexist(self):
+        """切换到zstd后新对象用zstd写入，旧的zlib对象照常读取"""
+        zlib_hash = self.odb.store_object(Blob('old'))
+        self.odb.set_compression('zstd')
+        zstd_hash = self.odb.store_object(Blob('new'))
+        
+        self.assertTrue(self._object_bytes(zstd_hash).startswith(_ZSTD_MAGIC))
+        reader = ObjectDatabase(self.repo_dir)
+        self.assertEqual(reader.get_object(zlib_hash).content, b'old')
+        self.assertEqual(reader.get_object(zstd_hash).content, b'new')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+仓库状态缓存的测试
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.core.repository_manager import Repository
+
+
+class StatusCacheTests(unittest.TestCase):
+    """status()结果缓存"""
+    
+    def setUp(self):
+        self.repo_dir = Path(tempfile.mkdtemp())
+        self.repo = Repository(str(self.repo_dir))
+        self.repo.init()
+        (self.repo_dir / 'a.txt').write_bytes(b'hello')
+        self.repo.add(['a.txt'])
+        self.repo.commit('init')
+    
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir)
+    
+    def _later(self):
+        """把当前时间推后，让刚写入的文件不再处于racy窗口内"""
+        now = time.time_ns() + 10_000_000_000
+        return mock.patch('src.core.repository_manager.time.time_ns', return_value=now)
+    
+    def test_recent_changes_are_not_cached(self):
+        """刚修改过的工作目录不写入缓存，同一mtime内的改写仍能被发现"""
+        self.assertTrue(self.repo.status()['is_clean'])
+        self.assertIsNone(self.repo._status_cache)
+        
+        path = self.repo_dir / 'a.txt'
+        stat = path.stat()
+        path.write_bytes(b'world')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.repo.status()['modified_files'], ['a.txt'])
+    
+    def test_cached_result_is_a_copy(self):
+        """修改返回的结果不会影响缓存"""
+        with self._later():
+            first = self.repo.status()
+            first['untracked_files'].append('bogus')
+            second = self.repo.status()
+        
+        self.assertIsNotNone(self.repo._status_cache)
+        self.assertEqual(second['untracked_files'], [])
+    
+    def test_worktree_change_invalidates_cache(self):
+        """新增文件改变工作目录签名，不会返回过期的缓存"""
+        with self._later():
+            self.assertTrue(self.repo.status()['is_clean'])
+            (self.repo_dir / 'b.txt').write_bytes(b'new')
+            status = self.repo.status()
+        
+        self.assertEqual(status['untracked_files'], ['b.txt'])
+    
+    @unittest.skipUnless(hasattr(os, 'symlink'), "不支持符号链接")
+    def test_dangling_symlink(self):
+        """悬空的符号链接不会让status出错"""
+        try:
+            os.symlink(str(self.repo_dir / 'missing'), str(self.repo_dir / 'link'))
+        except OSError:
+            self.skipTest("无法创建符号链接")
+        
+        with self._later():
+            self.assertEqual(self.repo.status()['untracked_files'], ['link'])
+            self.assertEqual(self.repo.status()['untracked_files'], ['link'])
+
+
+if __name__ == '__main__':
+    unittest.main()
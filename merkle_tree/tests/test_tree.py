@@ -0,0 +1,86 @@
+"""
+Tree对象的测试
+"""
+
+import unittest
+
+from src.objects.blob import Blob
+from src.objects.tree import Tree
+
+
+def _build_expected(depth: int) -> Tree:
+    """直接构建同样结构的Tree，作为对照"""
+    leaf = Tree()
+    leaf.add_blob(Blob('x'), 'f')
+    tree = leaf
+    for name in ['d', 'p'][:depth]:
+        parent = Tree()
+        parent.add_tree(tree, name)
+        tree = parent
+    return tree
+
+
+class TreeInvalidationTests(unittest.TestCase):
+    """子Tree修改后祖先哈希的失效"""
+    
+    def test_child_change_after_serialize(self):
+        """父Tree序列化后再修改子Tree，父Tree的哈希要随之更新"""
+        parent = Tree()
+        child = Tree()
+        parent.add_tree(child, 'd')
+        parent.serialize()
+        child.add_blob(Blob('x'), 'f')
+        
+        self.assertEqual(parent.hash, _build_expected(1).hash)
+    
+    def test_child_change_after_size(self):
+        """读取size只生成内容，之后修改子Tree同样要让父Tree失效"""
+        parent = Tree()
+        child = Tree()
+        parent.add_tree(child, 'd')
+        parent.size
+        child.add_blob(Blob('x'), 'f')
+        
+        self.assertEqual(parent.hash, _build_expected(1).hash)
+    
+    def test_grandchild_change_after_serialize(self):
+        """修改要沿父指针一直传到缓存了内容的祖父Tree"""
+        grandparent = Tree()
+        parent = Tree()
+        child = Tree()
+        parent.add_tree(child, 'd')
+        grandparent.add_tree(parent, 'p')
+        grandparent.serialize()
+        child.add_blob(Blob('x'), 'f')
+        
+        self.assertEqual(grandparent.hash, _build_expected(2).hash)
+    
+    def test_move_subtree_to_new_parent(self):
+        """子Tree挂到新父Tree后，原父Tree保留移动时的哈希，不再随子Tree变化"""
+        old_parent = Tree()
+        new_parent = Tree()
+        child = Tree()
+        child.add_blob(Blob('x'), 'f')
+        old_parent.add_tree(child, 'd')
+        new_parent.add_tree(child, 'd')
+        child.add_blob(Blob('y'), 'g')
+        
+        self.assertEqual(old_parent.hash, _build_expected(1).hash)
+        self.assertIs(child._parent, new_parent)
+        expected = _build_expected(1)
+        expected._children['d'].add_blob(Blob('y'), 'g')
+        self.assertEqual(new_parent.hash, expected.hash)
+    
+    def test_move_unhashed_subtree(self):
+        """从未计算过哈希的子Tree移走后，原父Tree的条目不能留下空哈希"""
+        old_parent = Tree()
+        child = Tree()
+        child.add_blob(Blob('x'), 'f')
+        old_parent.add_tree(child, 'd')
+        Tree().add_tree(child, 'd')
+        
+        self.assertEqual(old_parent.hash, _build_expected(1).hash)
+
+
+if __name__ == '__main__':
+    unittest.main()